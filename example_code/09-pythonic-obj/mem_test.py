@@ -1,24 +1,57 @@
+"""
+Compare RAM usage and construction time of many 2d points, with each
+representation given on the command line, for example::
+
+    $ python3 mem_test.py vector2d_v3 vector2d_v3_slots vector2d_array
+
+Modules with a ``Vector2dArray`` class are measured building one array of
+points; other modules building a list of ``Vector2d`` instances. Each
+module is measured in a new process, because ``ru_maxrss`` is the peak
+memory usage of the process (in kilobytes on Linux, bytes on macOS).
+"""
+
 import importlib
-import sys
+import itertools
 import resource
+import subprocess
+import sys
+import time
 
 NUM_VECTORS = 10**7
 
-if len(sys.argv) == 2:
-    module_name = sys.argv[1].replace('.py', '')
+
+def measure(module_name, num_vectors):
     module = importlib.import_module(module_name)
-else:
-    print('Usage: {} <vector-module-to-test>'.format())
-    sys.exit(1)
+    mem_init = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    t0 = time.perf_counter()
+    if hasattr(module, 'Vector2dArray'):
+        vectors = module.Vector2dArray.fromxy(
+            itertools.repeat(3.0, num_vectors),
+            itertools.repeat(4.0, num_vectors))
+    else:
+        vectors = [module.Vector2d(3.0, 4.0) for i in range(num_vectors)]
+    elapsed = time.perf_counter() - t0
+    mem_final = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print('{:20} {:>16} {:14,} {:14,} {:10.2f}'.format(
+          module_name, type(vectors).__name__, mem_init, mem_final, elapsed))
+    return vectors
 
-fmt = 'Selected Vector2d type: {.__name__}.{.__name__}'
-print(fmt.format(module, module.Vector2d))
 
-mem_init = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
-print('Creating {:,} Vector2d instances'.format(NUM_VECTORS))
+def main(module_names, num_vectors=NUM_VECTORS):
+    print('Creating {:,} 2d points with each module'.format(num_vectors))
+    print('{:20} {:>16} {:>14} {:>14} {:>10}'.format(
+          'module', 'container', 'initial RSS', 'final RSS', 'seconds'))
+    sys.stdout.flush()
+    for name in module_names:
+        subprocess.run([sys.executable, __file__, '--measure', name,
+                        str(num_vectors)], check=True)
 
-vectors = [module.Vector2d(3.0, 4.0) for i in range(NUM_VECTORS)]
 
-mem_final = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
-print('Initial RAM usage: {:14,}'.format(mem_init))
-print('  Final RAM usage: {:14,}'.format(mem_final))
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--measure']:
+        measure(sys.argv[2], int(sys.argv[3]))
+    elif len(sys.argv) > 1:
+        main([name.replace('.py', '') for name in sys.argv[1:]])
+    else:
+        print('Usage: {} <vector-module-to-test>...'.format(sys.argv[0]))
+        sys.exit(1)
@@ -0,0 +1,177 @@
+"""
+A ``Vector2dArray`` stores many 2d points as two arrays, one for all ``x``
+and one for all ``y`` coordinates, instead of one object per point::
+
+    >>> points = Vector2dArray([(3, 4), Vector2d(1, 1), (0, 0)])
+    >>> points
+    Vector2dArray([(3.0, 4.0), (1.0, 1.0), (0.0, 0.0)])
+    >>> len(points)
+    3
+    >>> Vector2dArray.fromxy(range(10), range(10, 20))
+    Vector2dArray([(0.0, 10.0), (1.0, 11.0), (2.0, 12.0), ...])
+    >>> Vector2dArray.fromxy([1, 2], [3])
+    Traceback (most recent call last):
+      ...
+    ValueError: x and y must have the same length, got 2 and 1
+
+
+Items are proxies implementing the ``Vector2d`` protocol, reading their
+coordinates from the arrays::
+
+    >>> v1 = points[0]
+    >>> v1
+    Vector2d(3.0, 4.0)
+    >>> v1.x, v1.y, abs(v1), bool(points[-1])
+    (3.0, 4.0, 5.0, False)
+    >>> v1 == Vector2d(3, 4), hash(v1) == hash(Vector2d(3, 4))
+    (True, True)
+    >>> bytes(v1) == bytes(Vector2d(3, 4))
+    True
+    >>> format(points[1], '.3ep')
+    '<1.414e+00, 7.854e-01>'
+    >>> points[1].angle() == Vector2d(1, 1).angle()
+    True
+    >>> points[1:]
+    Vector2dArray([(1.0, 1.0), (0.0, 0.0)])
+    >>> points[3]
+    Traceback (most recent call last):
+      ...
+    IndexError: Vector2dArray index out of range
+
+
+``format_points`` formats many points in one pass: it maps ``math.hypot``
+and ``math.atan2`` over the coordinate arrays and one format string over
+the results, then joins the text, instead of calling ``format()`` on each
+``Vector2d``::
+
+    >>> print(format_points(points, '.2f'))
+    (3.00, 4.00)
+    (1.00, 1.00)
+    (0.00, 0.00)
+    >>> format_points([Vector2d(3, 4), (0, 2)], '.3ep', sep='; ')
+    '<5.000e+00, 9.273e-01>; <2.000e+00, 1.571e+00>'
+    >>> text = '\\n'.join(format(v, 'p') for v in points)
+    >>> format_points(points, 'p') == text
+    True
+    >>> import io
+    >>> out = io.StringIO()
+    >>> format_points(points, '.1f', sep=' ', file=out, chunk_size=2)
+    >>> out.getvalue()
+    '(3.0, 4.0) (1.0, 1.0) (0.0, 0.0)'
+
+
+``mem_test.py`` compares the memory and construction time of this class
+with lists of ``Vector2d`` instances.
+
+"""
+
+from array import array
+import math
+import numbers
+
+from vector2d_v3 import Vector2d
+
+
+class Vector2dProxy(Vector2d):
+    """A ``Vector2d`` reading its coordinates from a ``Vector2dArray``"""
+
+    __slots__ = ('_points', '_index')
+
+    def __init__(self, points, index):
+        self._points = points
+        self._index = index
+
+    @property
+    def x(self):
+        return self._points._x[self._index]
+
+    @property
+    def y(self):
+        return self._points._y[self._index]
+
+    def __repr__(self):
+        return 'Vector2d({!r}, {!r})'.format(*self)
+
+
+class Vector2dArray:
+    typecode = 'd'
+
+    def __init__(self, points=()):
+        self._x = array(self.typecode)
+        self._y = array(self.typecode)
+        for x, y in points:
+            self._x.append(x)
+            self._y.append(y)
+
+    @classmethod
+    def fromxy(cls, xs, ys):
+        """build from separate iterables of ``x`` and ``y`` coordinates"""
+        points = cls()
+        points._x = array(cls.typecode, xs)
+        points._y = array(cls.typecode, ys)
+        if len(points._x) != len(points._y):
+            msg = 'x and y must have the same length, got {} and {}'
+            raise ValueError(msg.format(len(points._x), len(points._y)))
+        return points
+
+    def __len__(self):
+        return len(self._x)
+
+    def __iter__(self):
+        return (Vector2dProxy(self, i) for i in range(len(self)))
+
+    def __getitem__(self, index):
+        cls = type(self)
+        if isinstance(index, slice):
+            return cls.fromxy(self._x[index], self._y[index])
+        elif isinstance(index, numbers.Integral):
+            if index < 0:
+                index += len(self)
+            if not 0 <= index < len(self):
+                raise IndexError('{} index out of range'.format(cls.__name__))
+            return Vector2dProxy(self, index)
+        else:
+            msg = '{.__name__} indices must be integers'
+            raise TypeError(msg.format(cls))
+
+    def __repr__(self):
+        points = [str(tuple(point)) for point in self[:4]]
+        if len(self) > 3:
+            points[-1] = '...'
+        return '{}([{}])'.format(type(self).__name__, ', '.join(points))
+
+
+def _cartesian(xs, ys):
+    return xs, ys
+
+
+def _polar(xs, ys):
+    """magnitudes and angles of all points, like ``abs()`` and ``angle()``"""
+    return map(math.hypot, xs, ys), map(math.atan2, ys, xs)
+
+
+def format_points(points, fmt_spec='', sep='\n', file=None,
+                  chunk_size=2**16):
+    """format points like ``Vector2d.__format__``, joined by ``sep``
+
+    If ``file`` is given, the text is written to it ``chunk_size`` points
+    at a time and ``None`` is returned.
+    """
+    if not isinstance(points, Vector2dArray):
+        points = Vector2dArray(points)
+    if fmt_spec.endswith('p'):
+        fmt_spec = fmt_spec[:-1]
+        outer_fmt, coords = '<{{:{0}}}, {{:{0}}}>', _polar
+    else:
+        outer_fmt, coords = '({{:{0}}}, {{:{0}}})', _cartesian
+    point_fmt = outer_fmt.format(fmt_spec).format
+    xs, ys = memoryview(points._x), memoryview(points._y)
+    chunks = (sep.join(map(point_fmt, *coords(xs[i:i + chunk_size],
+                                              ys[i:i + chunk_size])))
+              for i in range(0, len(xs), chunk_size))
+    if file is None:
+        return sep.join(chunks)
+    for i, chunk in enumerate(chunks):
+        if i:
+            file.write(sep)
+        file.write(chunk)
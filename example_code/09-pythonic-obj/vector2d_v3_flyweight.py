@@ -0,0 +1,73 @@
+"""
+A 2-dimensional vector class with a flyweight factory
+
+``Vector2d.of(x, y)`` returns a shared instance for points built over and
+over, such as grid points and unit vectors. Sharing is safe because
+``Vector2d`` instances are immutable and hashable::
+
+    >>> Vector2d.of.cache_clear()
+    >>> v1 = Vector2d.of(3, 4)
+    >>> v1
+    Vector2d(3.0, 4.0)
+    >>> Vector2d.of(3, 4) is v1, Vector2d.of(3.0, 4.0) is v1
+    (True, True)
+    >>> Vector2d(3, 4) is v1  # the constructor always builds a new instance
+    False
+    >>> Vector2d.of.cache_info()
+    CacheInfo(hits=2, misses=1, maxsize=4096, currsize=1)
+
+
+``of`` is a ``functools.lru_cache`` around the class, so a hit costs a
+lookup in C instead of ``__init__`` and two ``float()`` conversions.
+The cache is bounded: when it holds ``flyweight_size`` points, the least
+recently used one is evicted::
+
+    >>> class SmallCacheVector2d(Vector2d):
+    ...     flyweight_size = 2
+    ...
+    >>> SmallCacheVector2d.of.cache_clear()
+    >>> a = SmallCacheVector2d.of(0, 1)
+    >>> b = SmallCacheVector2d.of(1, 0)
+    >>> SmallCacheVector2d.of(0, 1) is a  # (0, 1) is now most recent
+    True
+    >>> c = SmallCacheVector2d.of(1, 1)  # evicts (1, 0)
+    >>> SmallCacheVector2d.of(0, 1) is a, SmallCacheVector2d.of(1, 0) is b
+    (True, False)
+    >>> SmallCacheVector2d.of.cache_info()
+    CacheInfo(hits=2, misses=4, maxsize=2, currsize=2)
+
+
+Each subclass has its own cache, and coordinates must be hashable::
+
+    >>> type(SmallCacheVector2d.of(3, 4)), Vector2d.of.cache_info().currsize
+    (<class 'vector2d_v3_flyweight.SmallCacheVector2d'>, 1)
+    >>> Vector2d.of(3, [4])
+    Traceback (most recent call last):
+      ...
+    TypeError: unhashable type: 'list'
+
+Coordinates that compare equal share an instance: after
+``Vector2d.of(0, 0)``, ``Vector2d.of(-0.0, 0)`` returns
+``Vector2d(0.0, 0.0)``.
+
+"""
+
+import functools
+
+import vector2d_v3
+
+
+class Vector2d(vector2d_v3.Vector2d):
+    flyweight_size = 4096
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._init_flyweights()
+
+    @classmethod
+    def _init_flyweights(cls):
+        """give ``cls`` its own ``of`` factory and LRU cache"""
+        cls.of = staticmethod(functools.lru_cache(cls.flyweight_size)(cls))
+
+
+Vector2d._init_flyweights()
@@ -0,0 +1,315 @@
+"""
+A ``VectorArray`` holds many same-length ``Vector`` instances in one
+contiguous buffer of ``len(va) * va.dim`` components::
+
+    >>> va = VectorArray([[3, 4], [1, 1], [0, 0]])
+    >>> va
+    VectorArray([[3.0, 4.0], [1.0, 1.0], [0.0, 0.0]])
+    >>> len(va), va.dim
+    (3, 2)
+    >>> VectorArray(Vector(range(n, n + 3)) for n in range(10))
+    VectorArray([[0.0, 1.0, 2.0], [1.0, 2.0, 3.0], ...])
+    >>> VectorArray([[1, 2], [3]])
+    Traceback (most recent call last):
+      ...
+    ValueError: VectorArray rows must have 2 components, got 1
+    >>> VectorArray([], dim=4)
+    VectorArray([], dim=4)
+
+
+Rows are zero-copy views that behave like ``Vector``::
+
+    >>> row = va[0]
+    >>> row
+    Vector([3.0, 4.0])
+    >>> row == Vector([3, 4]), abs(row), hash(row) == hash(Vector([3, 4]))
+    (True, 5.0, True)
+    >>> bytes(row) == bytes(Vector([3, 4]))
+    True
+    >>> row[1:], row.y
+    (Vector([4.0]), 4.0)
+    >>> va[-1]
+    Vector([0.0, 0.0])
+    >>> va[3]
+    Traceback (most recent call last):
+      ...
+    IndexError: VectorArray index out of range
+    >>> va[1:]
+    VectorArray([[1.0, 1.0], [0.0, 0.0]])
+    >>> list(va)
+    [Vector([3.0, 4.0]), Vector([1.0, 1.0]), Vector([0.0, 0.0])]
+
+
+A ``RowVector`` can also wrap any buffer in the ``bytes(vector)`` format,
+like ``bytes``, ``bytearray`` or ``mmap``, without copying it::
+
+    >>> octets = bytearray(bytes(Vector([3, 4])))
+    >>> shared = RowVector.frombuffer(octets)
+    >>> shared, abs(shared)
+    (Vector([3.0, 4.0]), 5.0)
+    >>> octets[1:9] = bytes(Vector([6]))[1:]  # changes show through
+    >>> shared
+    Vector([6.0, 4.0])
+    >>> bytes(shared) == bytes(octets)
+    True
+    >>> RowVector(memoryview(b'ab'))  # other formats are copied as numbers
+    Vector([97.0, 98.0])
+
+
+Bulk operations over all rows in one call::
+
+    >>> abs(va)
+    array('d', [5.0, 1.4142135623730951, 0.0])
+    >>> va.dot(Vector([1, 2]))
+    array('d', [11.0, 3.0, 0.0])
+    >>> va + VectorArray([[1, 1], [2, 2], [3, 3]])
+    VectorArray([[4.0, 5.0], [3.0, 3.0], [3.0, 3.0]])
+    >>> va + Vector([10, 20])  # a single vector is added to every row
+    VectorArray([[13.0, 24.0], [11.0, 21.0], [10.0, 20.0]])
+    >>> va * 10
+    VectorArray([[30.0, 40.0], [10.0, 10.0], [0.0, 0.0]])
+    >>> va + VectorArray([[1, 1]])
+    Traceback (most recent call last):
+      ...
+    ValueError: VectorArray shapes differ: (3, 2) and (1, 2)
+    >>> va * None
+    Traceback (most recent call last):
+      ...
+    TypeError: unsupported operand type(s) for *: 'VectorArray' and 'NoneType'
+
+
+Hyperspherical coordinates of every row::
+
+    >>> va3 = VectorArray([[1, 1, 1], [2, 2, 2], [0, 1, 0], [-1, -1, -1]])
+    >>> [['{:.5f}'.format(a) for a in angles] for angles in va3.angles()]
+    ... # doctest:+NORMALIZE_WHITESPACE
+    [['0.95532', '0.78540'], ['0.95532', '0.78540'],
+     ['1.57080', '0.00000'], ['2.18628', '3.92699']]
+    >>> print(format(va3, '.3eh'))
+    <1.732e+00, 9.553e-01, 7.854e-01>
+    <3.464e+00, 9.553e-01, 7.854e-01>
+    <1.000e+00, 1.571e+00, 0.000e+00>
+    <1.732e+00, 2.186e+00, 3.927e+00>
+    >>> print(format(va, '.1f'))
+    (3.0, 4.0)
+    (1.0, 1.0)
+    (0.0, 0.0)
+
+The bulk operations use NumPy over the same buffer when it is
+installed, and plain loops over ``memoryview`` slices otherwise.
+
+"""
+
+from array import array
+import reprlib
+import math
+import numbers
+
+from vector_v5 import Vector
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional: fall back to Python loops
+    numpy = None
+
+
+class RowVector(Vector):
+    """A ``Vector`` sharing its components with a ``VectorArray`` row"""
+
+    def __init__(self, components):
+        if (isinstance(components, memoryview) and
+                components.format == self.typecode):
+            self._components = components
+        else:
+            super().__init__(components)
+
+    def __repr__(self):
+        return repr(Vector(self._components[:6]))
+
+    def __bytes__(self):
+        return b''.join([bytes([ord(self.typecode)]), self._components])
+
+    @classmethod
+    def frombuffer(cls, octets):
+        """wrap the output of ``bytes(vector)`` without copying it"""
+        memv = memoryview(octets).toreadonly()
+        typecode = chr(memv[0])
+        return cls(memv[1:].cast(typecode))
+
+    @classmethod
+    def _wrap(cls, components):
+        """share a row of ``components`` keeping its format as typecode"""
+        row = cls.__new__(cls)
+        row.typecode = components.format
+        row._components = components
+        return row
+
+
+class VectorArray:
+    typecode = 'd'
+
+    def __init__(self, vectors, dim=None):
+        self._components = array(self.typecode)
+        count = 0
+        for vector in vectors:
+            row = array(self.typecode, vector)
+            if dim is None:
+                dim = len(row)
+            elif len(row) != dim:
+                msg = '{} rows must have {} components, got {}'
+                raise ValueError(msg.format(type(self).__name__,
+                                            dim, len(row)))
+            self._components.extend(row)
+            count += 1
+        self.dim = 0 if dim is None else dim
+        self._len = count
+
+    @classmethod
+    def _frombuffer(cls, components, dim):
+        """build an instance owning ``components`` without copying"""
+        va = cls.__new__(cls)
+        typecode = getattr(components, 'typecode', None) or components.format
+        if typecode != cls.typecode:
+            va.typecode = typecode
+        va._components = components
+        va.dim = dim
+        va._len = len(components) // dim if dim else 0
+        return va
+
+    def _matrix(self):
+        """NumPy 2-D view of the buffer, or ``None`` without NumPy"""
+        if numpy is None or not self._components:
+            return None
+        flat = numpy.frombuffer(self._components, dtype=self.typecode)
+        return flat.reshape(self._len, self.dim)
+
+    def _toarray(self, values):
+        result = array(self.typecode)
+        result.frombytes(values.astype(self.typecode).tobytes())
+        return result
+
+    def __len__(self):
+        return self._len
+
+    def _row(self, index):
+        start = index * self.dim
+        memv = memoryview(self._components).toreadonly()
+        return RowVector._wrap(memv[start:start + self.dim])
+
+    def __getitem__(self, index):
+        cls = type(self)
+        if isinstance(index, slice):
+            rows = range(*index.indices(len(self)))
+            return cls((self._row(i) for i in rows), self.dim)
+        elif isinstance(index, numbers.Integral):
+            if index < 0:
+                index += len(self)
+            if not 0 <= index < len(self):
+                raise IndexError('{} index out of range'.format(cls.__name__))
+            return self._row(index)
+        else:
+            msg = '{.__name__} indices must be integers'
+            raise TypeError(msg.format(cls))
+
+    def __iter__(self):
+        return (self._row(i) for i in range(len(self)))
+
+    def __repr__(self):
+        if not len(self):
+            return 'VectorArray([], dim={})'.format(self.dim)
+        rows = [reprlib.repr(list(self._row(i)))
+                for i in range(min(len(self), 3))]
+        if len(self) > 3:
+            rows[-1] = '...'
+        return 'VectorArray([{}])'.format(', '.join(rows))
+
+    def __abs__(self):
+        matrix = self._matrix()
+        if matrix is not None:
+            return self._toarray(numpy.sqrt(numpy.einsum('ij,ij->i',
+                                                         matrix, matrix)))
+        return array(self.typecode, (abs(row) for row in self))
+
+    def dot(self, query):
+        query = array(self.typecode, query)
+        if len(query) != self.dim:
+            msg = 'query must have {} components, got {}'
+            raise ValueError(msg.format(self.dim, len(query)))
+        matrix = self._matrix()
+        if matrix is not None:
+            return self._toarray(matrix @ numpy.frombuffer(query,
+                                                           self.typecode))
+        return array(self.typecode,
+                     (sum(a * b for a, b in zip(row, query)) for row in self))
+
+    def __add__(self, other):
+        if isinstance(other, VectorArray):
+            if (len(self), self.dim) != (len(other), other.dim):
+                msg = '{} shapes differ: {} and {}'
+                raise ValueError(msg.format(type(self).__name__,
+                                            (len(self), self.dim),
+                                            (len(other), other.dim)))
+            other_components = other._components
+            if other.typecode != self.typecode:
+                other_components = array(self.typecode, other_components)
+        else:
+            try:
+                row = array(self.typecode, other)
+            except TypeError:
+                return NotImplemented
+            if len(row) != self.dim:
+                return NotImplemented
+            other_components = row * len(self)
+        matrix = self._matrix()
+        if matrix is not None:
+            flat = numpy.frombuffer(other_components, self.typecode)
+            result = self._toarray(matrix.ravel() + flat)
+        else:
+            result = array(self.typecode,
+                           (a + b for a, b in zip(self._components,
+                                                  other_components)))
+        return VectorArray._frombuffer(result, self.dim)
+
+    def __radd__(self, other):
+        return self + other
+
+    def __mul__(self, scalar):
+        if not isinstance(scalar, numbers.Real):
+            return NotImplemented
+        matrix = self._matrix()
+        if matrix is not None:
+            result = self._toarray(matrix.ravel() * float(scalar))
+        else:
+            result = array(self.typecode,
+                           (x * scalar for x in self._components))
+        return VectorArray._frombuffer(result, self.dim)
+
+    def __rmul__(self, scalar):
+        return self * scalar
+
+    def angles(self):
+        matrix = self._matrix()
+        if matrix is None or self.dim < 2:
+            return (tuple(row.angles()) for row in self)
+        squares = matrix * matrix
+        # tails[:, n] is the norm of row[n:], from a reversed cumulative sum
+        tails = numpy.sqrt(numpy.cumsum(squares[:, ::-1], axis=1)[:, ::-1])
+        angles = numpy.arctan2(tails[:, 1:], matrix[:, :-1])
+        last = angles[:, -1]
+        last[matrix[:, -1] < 0] = math.pi * 2 - last[matrix[:, -1] < 0]
+        return (tuple(row) for row in angles.tolist())
+
+    def __format__(self, fmt_spec=''):
+        if fmt_spec.endswith('h'):  # hyperspherical coordinates
+            inner_spec = fmt_spec[:-1]
+            rows = ([norm] + list(angles) for norm, angles
+                    in zip(abs(self), self.angles()))
+            outer_fmt = '<{}>'
+        else:
+            inner_spec = fmt_spec
+            rows = self
+            outer_fmt = '({})'
+        lines = (outer_fmt.format(', '.join(format(c, inner_spec)
+                                            for c in row))
+                 for row in rows)
+        return '\n'.join(lines)
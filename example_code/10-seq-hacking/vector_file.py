@@ -0,0 +1,111 @@
+"""
+Files of many ``Vector`` instances, memory-mapped when loaded.
+
+A vector file starts with a 24-byte header: the magic bytes ``b'VECS'``,
+the array typecode, then the dimension and the number of vectors as
+unsigned 64-bit integers. The components of all vectors follow, in the
+machine format used by ``bytes(vector)``::
+
+    >>> import os, tempfile
+    >>> path = os.path.join(tempfile.mkdtemp(), 'demo.vecs')
+    >>> save_vectors(path, (Vector([n, n + 1, n + 2]) for n in range(1000)))
+    1000
+    >>> os.path.getsize(path)
+    24024
+
+
+``load_vectors`` maps the file into memory instead of reading it, so
+opening is instant and only the pages that are touched get read::
+
+    >>> va = load_vectors(path)
+    >>> va
+    VectorArray([[0.0, 1.0, 2.0], [1.0, 2.0, 3.0], ...])
+    >>> len(va), va.dim
+    (1000, 3)
+    >>> va[999]
+    Vector([999.0, 1000.0, 1001.0])
+    >>> abs(va[0]) == abs(Vector([0, 1, 2]))
+    True
+    >>> va.dot([1, 0, 0])[-3:]
+    array('d', [997.0, 998.0, 999.0])
+
+
+Other typecodes are kept when the file is loaded::
+
+    >>> save_vectors(path, [[1, 2], [3, 4]], typecode='f')
+    2
+    >>> va = load_vectors(path)
+    >>> va.typecode, va[1].typecode
+    ('f', 'f')
+    >>> va[1], va.dot([1, 1])
+    (Vector([3.0, 4.0]), array('f', [3.0, 7.0]))
+    >>> (va + va)[1], abs(va)
+    (Vector([6.0, 8.0]), array('f', [2.2360680103302, 5.0]))
+
+
+Errors::
+
+    >>> save_vectors(path, [[1, 2], [1, 2, 3]])
+    Traceback (most recent call last):
+      ...
+    ValueError: all vectors must have 2 components, got 3
+    >>> with open(path, 'wb') as fp:
+    ...     fp.write(bytes(Vector([1, 2])) * 3)
+    ...
+    51
+    >>> load_vectors(path)  # doctest:+ELLIPSIS
+    Traceback (most recent call last):
+      ...
+    ValueError: '...demo.vecs' is not a vector file
+
+"""
+
+from array import array
+import mmap
+import os
+import struct
+
+from vector_v5 import Vector
+from vector_array import VectorArray
+
+MAGIC = b'VECS'
+HEADER = struct.Struct('=4sc3xQQ')  # magic, typecode, dim, count
+
+
+def save_vectors(path, vectors, typecode='d'):
+    """write ``vectors`` to ``path``; return how many were written"""
+    dim = None
+    count = 0
+    with open(path, 'wb') as fp:
+        fp.write(bytes(HEADER.size))  # placeholder until count is known
+        for vector in vectors:
+            if isinstance(vector, Vector) and vector.typecode == typecode:
+                components = vector._components
+            else:
+                components = array(typecode, vector)
+            if dim is None:
+                dim = len(components)
+            elif len(components) != dim:
+                msg = 'all vectors must have {} components, got {}'
+                raise ValueError(msg.format(dim, len(components)))
+            fp.write(components)
+            count += 1
+        fp.seek(0)
+        fp.write(HEADER.pack(MAGIC, typecode.encode(), dim or 0, count))
+    return count
+
+
+def load_vectors(path):
+    """return a ``VectorArray`` backed by a read-only map of ``path``"""
+    with open(path, 'rb') as fp:
+        if os.fstat(fp.fileno()).st_size < HEADER.size:
+            raise ValueError('{!r} is not a vector file'.format(path))
+        octets = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, typecode, dim, count = HEADER.unpack_from(octets)
+    if magic != MAGIC:
+        raise ValueError('{!r} is not a vector file'.format(path))
+    typecode = typecode.decode()
+    components = memoryview(octets)[HEADER.size:].cast(typecode)
+    if len(components) != dim * count:
+        raise ValueError('{!r} is truncated'.format(path))
+    return VectorArray._frombuffer(components, dim)
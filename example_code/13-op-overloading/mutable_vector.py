@@ -0,0 +1,223 @@
+"""
+A ``MutableVector`` updates its components in place with the augmented
+assignment operators, so running sums do not build a new vector on each
+step::
+
+    >>> total = MutableVector([0, 0, 0])
+    >>> total_orig = total
+    >>> for v in [Vector([1, 2, 3]), Vector([4, 5, 6]), (10, 10, 10)]:
+    ...     total += v
+    ...
+    >>> total
+    MutableVector([15.0, 17.0, 19.0])
+    >>> total is total_orig
+    True
+    >>> total -= Vector([5, 7])  # short operands are padded with 0.0
+    >>> total
+    MutableVector([10.0, 10.0, 19.0])
+    >>> total *= 0.5
+    >>> total, abs(MutableVector([3, 4]))
+    (MutableVector([5.0, 5.0, 9.5]), 5.0)
+    >>> total += 1
+    Traceback (most recent call last):
+      ...
+    TypeError: right operand in += must be 'MutableVector' or an iterable
+    >>> total += Vector(range(4))
+    Traceback (most recent call last):
+      ...
+    ValueError: operand has 4 components, MutableVector has 3
+
+
+``axpy(a, x)`` adds ``a * x`` in place without building ``a * x``. With
+``array`` storage the components are updated one by one; with NumPy,
+``a * x`` goes to a scratch buffer kept by the vector and reused on each
+call, so a running sum allocates nothing after the first step::
+
+    >>> acc = MutableVector([1, 1])
+    >>> acc.axpy(10, Vector([1, 2]))
+    MutableVector([11.0, 21.0])
+    >>> acc
+    MutableVector([11.0, 21.0])
+
+
+Components can be assigned, and the cached norm is discarded::
+
+    >>> acc = MutableVector([3, 4])
+    >>> abs(acc)
+    5.0
+    >>> acc[1] = 0
+    >>> acc[:1] = [6]
+    >>> acc, abs(acc)
+    (MutableVector([6.0, 0.0]), 6.0)
+
+
+Hashing and immutability rules: a ``MutableVector`` is unhashable, like a
+``list``, and its slices are copies, not views. ``Vector(mv)`` makes an
+immutable, hashable snapshot::
+
+    >>> hash(acc)
+    Traceback (most recent call last):
+      ...
+    TypeError: unhashable type: 'MutableVector'
+    >>> part = acc[:1]
+    >>> acc[0] = 1
+    >>> part, acc == Vector([1, 0]), hash(Vector(acc)) == hash(Vector([1, 0]))
+    (MutableVector([6.0]), True, True)
+    >>> acc + Vector([1, 1])  # binary operators return a new Vector
+    Vector([2.0, 1.0])
+
+
+The same works with NumPy storage (or ``array`` if NumPy is missing)::
+
+    >>> total = MutableVector([0, 0], use_numpy=True)
+    >>> total += Vector([1, 2])
+    >>> total.axpy(2, [1, 1])
+    MutableVector([3.0, 4.0])
+    >>> total *= 2
+    >>> total
+    MutableVector([6.0, 8.0])
+    >>> total.axpy(0.5, [2])
+    MutableVector([7.0, 8.0])
+    >>> total.axpy(-1, Vector([1, 1]))
+    MutableVector([6.0, 7.0])
+
+
+With an integer typecode, an update that does not fit changes nothing,
+with either storage::
+
+    >>> for use_numpy in False, True:
+    ...     m = MutableVector([30000, 30000], use_numpy, typecode='h')
+    ...     try:
+    ...         m += Vector([1, 10000], typecode='h')
+    ...     except OverflowError:
+    ...         print(m)
+    ...     try:
+    ...         m *= 2
+    ...     except OverflowError:
+    ...         print(m)
+    ...
+    (30000, 30000)
+    (30000, 30000)
+    (30000, 30000)
+    (30000, 30000)
+    >>> m += Vector([0.5, 0.5])
+    Traceback (most recent call last):
+      ...
+    TypeError: 'float' object cannot be interpreted as an integer
+    >>> m
+    MutableVector([30000, 30000], typecode='h')
+
+"""
+
+from array import array
+import collections.abc
+import numbers
+
+from vector_py3_5 import Vector, FLOAT_TYPECODES
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional: fall back to array storage
+    numpy = None
+
+
+class MutableVector(Vector):
+
+    __hash__ = None  # mutable, so unhashable
+
+    def __repr__(self):
+        return type(self).__name__ + super().__repr__()[len('Vector'):]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):  # copy: a view would see changes
+            return type(self)(self._components[index],
+                              use_numpy=self._vectorized,
+                              typecode=self.typecode)
+        return super().__getitem__(index)
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice) and not self._vectorized:
+            value = array(self.typecode, value)
+        self._components[index] = value
+        self._norm = None
+
+    def _operand(self, other):
+        """components of ``other`` to combine with ``self`` in place"""
+        if isinstance(other, Vector):
+            components = other._components
+        else:
+            components = array(self.typecode, other)
+        if len(components) > len(self):
+            msg = 'operand has {} components, {} has {}'
+            raise ValueError(msg.format(len(components),
+                                        type(self).__name__, len(self)))
+        return components
+
+    def axpy(self, a, x):
+        """add ``a * x`` to ``self`` in place; return ``self``"""
+        components = self._operand(x)
+        size = len(components)
+        if self.typecode not in FLOAT_TYPECODES:  # results may not fit
+            pairs = zip(self._components[:size].tolist(), components.tolist())
+            self._update((v + a * b for v, b in pairs), size)
+        elif self._vectorized:
+            target = self._components[:size]  # a view: updates self
+            if a == 1:
+                target += numpy.asarray(components)
+            else:
+                products = self._scratch(size)
+                numpy.multiply(numpy.asarray(components), a, out=products)
+                target += products
+        else:
+            target = self._components
+            if a == 1:
+                for i, b in enumerate(components):
+                    target[i] += b
+            else:
+                for i, b in enumerate(components):
+                    target[i] += a * b
+        self._norm = None
+        return self
+
+    def _scratch(self, size):
+        """a reusable NumPy buffer of ``size`` items of our dtype"""
+        scratch = getattr(self, '_scratch_buffer', None)
+        if scratch is None or len(scratch) != len(self):
+            scratch = numpy.empty_like(self._components)
+            self._scratch_buffer = scratch
+        return scratch[:size]
+
+    def _update(self, values, size):
+        """store ``values`` as the first ``size`` components; all of them
+        are converted before any is stored, so a failure changes nothing"""
+        results = array(self.typecode, values)
+        if self._vectorized:
+            results = numpy.frombuffer(results, dtype=self.typecode)
+        self._components[:size] = results
+
+    def _inplace(self, a, other, symbol):
+        if not isinstance(other, collections.abc.Iterable):
+            msg = 'right operand in {} must be {!r} or an iterable'
+            raise TypeError(msg.format(symbol, type(self).__name__))
+        return self.axpy(a, other)
+
+    def __iadd__(self, other):
+        return self._inplace(1, other, '+=')
+
+    def __isub__(self, other):
+        return self._inplace(-1, other, '-=')
+
+    def __imul__(self, scalar):
+        if not isinstance(scalar, numbers.Real):
+            return NotImplemented
+        components = self._components
+        if self.typecode not in FLOAT_TYPECODES:  # results may not fit
+            products = (x * scalar for x in components.tolist())
+            self._update(products, len(components))
+        elif self._vectorized:
+            components *= scalar
+        else:
+            for i in range(len(components)):
+                components[i] *= scalar
+        self._norm = None
+        return self
@@ -0,0 +1,283 @@
+"""
+A ``SparseVector`` stores only the non-zero components of a ``Vector``,
+as an array of indices and an array of values::
+
+    >>> sv = SparseVector(10**6, {3: 1.5, 999999: -2, 7: 0})
+    >>> sv
+    SparseVector(1000000, {3: 1.5, 999999: -2.0})
+    >>> len(sv), sv[3], sv[4], sv[-1]
+    (1000000, 1.5, 0.0, -2.0)
+    >>> abs(SparseVector(5, {1: 3, 4: 4}))
+    5.0
+    >>> bool(sv), bool(SparseVector(3))
+    (True, False)
+    >>> SparseVector.fromdense([0, 0, 7, 0, 8])
+    SparseVector(5, {2: 7.0, 4: 8.0})
+    >>> SparseVector(10, range(100))
+    Traceback (most recent call last):
+      ...
+    TypeError: items must be a mapping or (index, value) pairs
+    >>> SparseVector(3, {3: 1.0})
+    Traceback (most recent call last):
+      ...
+    IndexError: SparseVector index 3 out of range for 3 dimensions
+
+
+Slicing returns a ``SparseVector``::
+
+    >>> sv5 = SparseVector.fromdense([0, 1, 0, 3, 4])
+    >>> sv5[1:4]
+    SparseVector(3, {0: 1.0, 2: 3.0})
+    >>> sv5[::-2], list(sv5[::-2])
+    (SparseVector(3, {0: 4.0}), [4.0, 0.0, 0.0])
+    >>> sv5['x']
+    Traceback (most recent call last):
+      ...
+    TypeError: SparseVector indices must be integers
+
+
+Interoperation with dense vectors::
+
+    >>> dense = Vector([1, 1, 1, 1, 1])
+    >>> sv5 == Vector([0, 1, 0, 3, 4]), Vector([0, 1, 0, 3, 4]) == sv5
+    (True, True)
+    >>> hash(sv5) == hash(Vector([0, 1, 0, 3, 4]))
+    True
+    >>> sv5 == dense, sv5 == [0, 1, 0, 3, 4]
+    (False, False)
+    >>> sv5 + dense, dense + sv5
+    (Vector([1.0, 2.0, 1.0, 4.0, 5.0]), Vector([1.0, 2.0, 1.0, 4.0, 5.0]))
+    >>> sv5 + SparseVector(6, {0: 2, 3: -3})
+    SparseVector(6, {0: 2.0, 1: 1.0, 4: 4.0})
+    >>> sv5 * 10, 0.5 * sv5
+    (SparseVector(5, {1: 10.0, 3: 30.0, 4: 40.0}), SparseVector(5, {1: 0.5, 3: 1.5, 4: 2.0}))
+    >>> sv5 @ dense, dense @ sv5, sv5 @ sv5
+    (8.0, 8.0, 26.0)
+    >>> sv5.todense()
+    Vector([0.0, 1.0, 0.0, 3.0, 4.0])
+    >>> sv5 + 1
+    Traceback (most recent call last):
+      ...
+    TypeError: unsupported operand type(s) for +: 'SparseVector' and 'int'
+
+
+Operations with a sparse left operand cost O(non-zeros) plus, when the
+other operand is dense, a copy of it. With a dense left operand the
+``Vector`` method iterates over all components.
+
+
+``bytes()`` stores the dimension, the count of non-zeros, the indices and
+the values::
+
+    >>> octets = bytes(sv)
+    >>> len(octets)
+    49
+    >>> SparseVector.frombytes(octets) == sv
+    True
+    >>> SparseVector.frombytes(octets[:-1])
+    Traceback (most recent call last):
+      ...
+    ValueError: SparseVector bytes are truncated
+    >>> class FloatSparseVector(SparseVector):
+    ...     typecode = 'f'
+    ...
+    >>> FloatSparseVector.frombytes(octets)
+    Traceback (most recent call last):
+      ...
+    ValueError: FloatSparseVector bytes have typecode 'd', expected 'f'
+
+"""
+
+from array import array
+import bisect
+import collections.abc
+import functools
+import itertools
+import math
+import numbers
+import operator
+import reprlib
+import struct
+
+from vector_py3_5 import Vector
+
+HEADER = struct.Struct('=cQQ')  # typecode, dimensions, non-zero count
+
+
+class SparseVector:
+    typecode = 'd'
+    index_typecode = 'q'
+
+    def __init__(self, dim, items=()):
+        self._dim = dim
+        try:
+            pairs = sorted((operator.index(i), v)
+                           for i, v in dict(items).items() if v)
+        except TypeError:
+            msg = 'items must be a mapping or (index, value) pairs'
+            raise TypeError(msg) from None
+        for i, v in pairs[:1] + pairs[-1:]:
+            if not 0 <= i < dim:
+                msg = '{} index {} out of range for {} dimensions'
+                raise IndexError(msg.format(type(self).__name__, i, dim))
+        self._indices = array(self.index_typecode, (i for i, v in pairs))
+        self._values = array(self.typecode, (v for i, v in pairs))
+
+    @classmethod
+    def _wrap(cls, dim, indices, values):
+        """build an instance sharing ``indices`` and ``values`` arrays"""
+        sv = cls.__new__(cls)
+        sv._dim = dim
+        sv._indices = indices
+        sv._values = values
+        return sv
+
+    @classmethod
+    def fromdense(cls, components):
+        return cls(len(components), ((i, v) for i, v in
+                                     enumerate(components) if v))
+
+    def todense(self):
+        components = array(self.typecode, [0.0]) * self._dim
+        for i, v in self.items():
+            components[i] = v
+        return Vector._wrap(components)
+
+    def items(self):
+        """pairs of (index, value) for the non-zero components"""
+        return zip(self._indices, self._values)
+
+    def __len__(self):
+        return self._dim
+
+    def __iter__(self):
+        last = 0
+        for i, v in self.items():
+            yield from itertools.repeat(0.0, i - last)
+            yield v
+            last = i + 1
+        yield from itertools.repeat(0.0, self._dim - last)
+
+    def __repr__(self):
+        items = reprlib.repr(dict(itertools.islice(self.items(), 5)))
+        return '{}({}, {})'.format(type(self).__name__, self._dim, items)
+
+    def __bytes__(self):
+        header = HEADER.pack(self.typecode.encode(), self._dim,
+                             len(self._values))
+        return b''.join([header, self._indices, self._values])
+
+    @classmethod
+    def frombytes(cls, octets):
+        memv = memoryview(octets)
+        if len(memv) < HEADER.size:
+            raise ValueError('{} bytes are truncated'.format(cls.__name__))
+        typecode, dim, count = HEADER.unpack_from(memv)
+        typecode = typecode.decode()
+        if typecode != cls.typecode:  # the values would not match it
+            msg = '{} bytes have typecode {!r}, expected {!r}'
+            raise ValueError(msg.format(cls.__name__, typecode, cls.typecode))
+        indices = array(cls.index_typecode)
+        values = array(typecode)
+        size = count * (indices.itemsize + values.itemsize)
+        if len(memv) < HEADER.size + size:
+            raise ValueError('{} bytes are truncated'.format(cls.__name__))
+        start = HEADER.size
+        indices.frombytes(memv[start:start + count * indices.itemsize])
+        start += count * indices.itemsize
+        values.frombytes(memv[start:start + count * values.itemsize])
+        return cls._wrap(dim, indices, values)
+
+    def __eq__(self, other):
+        if isinstance(other, SparseVector):
+            return (len(self) == len(other) and
+                    self._indices == other._indices and
+                    memoryview(self._values) == memoryview(other._values))
+        elif isinstance(other, Vector):
+            return (len(self) == len(other) and
+                    all(a == b for a, b in zip(self, other)))
+        else:
+            return NotImplemented
+
+    def __hash__(self):  # zeros do not change the XOR of a Vector hash
+        hashes = (hash(x) for x in self._values)
+        return functools.reduce(operator.xor, hashes, 0)
+
+    def __abs__(self):
+        return math.sqrt(sum(x * x for x in self._values))
+
+    def __bool__(self):
+        return bool(self._values)
+
+    def __getitem__(self, index):
+        cls = type(self)
+        if isinstance(index, slice):
+            positions = range(*index.indices(len(self)))
+            if not positions:
+                return cls(0)
+            lo = bisect.bisect_left(self._indices, min(positions))
+            hi = bisect.bisect_right(self._indices, max(positions))
+            pairs = ((positions.index(i), v) for i, v in
+                     zip(self._indices[lo:hi], self._values[lo:hi])
+                     if i in positions)
+            return cls(len(positions), pairs)
+        elif isinstance(index, numbers.Integral):
+            if index < 0:
+                index += len(self)
+            if not 0 <= index < len(self):
+                raise IndexError('{} index out of range'.format(cls.__name__))
+            pos = bisect.bisect_left(self._indices, index)
+            if pos < len(self._indices) and self._indices[pos] == index:
+                return self._values[pos]
+            return 0.0
+        else:
+            msg = '{.__name__} indices must be integers'
+            raise TypeError(msg.format(cls))
+
+    def __add__(self, other):
+        if isinstance(other, SparseVector):
+            sums = {}
+            for i, v in itertools.chain(self.items(), other.items()):
+                sums[i] = sums.get(i, 0.0) + v
+            return SparseVector(max(len(self), len(other)), sums)
+        try:
+            components = array(self.typecode, other)
+        except TypeError:
+            return NotImplemented
+        if len(components) < len(self):
+            components.extend(itertools.repeat(0.0,
+                                               len(self) - len(components)))
+        for i, v in self.items():
+            components[i] += v
+        return Vector._wrap(components)
+
+    def __radd__(self, other):
+        return self + other
+
+    def __mul__(self, scalar):
+        if isinstance(scalar, numbers.Real):
+            return SparseVector(len(self), ((i, v * scalar)
+                                            for i, v in self.items()))
+        else:
+            return NotImplemented
+
+    def __rmul__(self, scalar):
+        return self * scalar
+
+    def __matmul__(self, other):
+        if isinstance(other, SparseVector):
+            if len(other._values) < len(self._values):
+                self, other = other, self
+            return sum(v * other[i] for i, v in self.items()
+                       if i < len(other))
+        if isinstance(other, Vector):
+            if not other._vectorized:
+                other = other._components
+        elif isinstance(other, collections.abc.Sequence):
+            pass
+        else:
+            return NotImplemented
+        return sum(v * other[i] for i, v in self.items() if i < len(other))
+
+    def __rmatmul__(self, other):
+        return self @ other
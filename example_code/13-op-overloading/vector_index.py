@@ -0,0 +1,229 @@
+"""
+Similarity search over collections of ``Vector`` instances.
+
+A ``VectorIndex`` stores the norms of its vectors when it is built, so
+each query costs one dot product per vector::
+
+    >>> vectors = [Vector([1, 0]), Vector([0, 1]), Vector([1, 1]),
+    ...            Vector([-1, 0]), Vector([3, 1])]
+    >>> index = VectorIndex(vectors)
+    >>> len(index), index.dim
+    (5, 2)
+    >>> for match in index.search(Vector([2, 1]), k=3):  # doctest:+ELLIPSIS
+    ...     print(match)
+    Match(score=0.98994949..., pos=4)
+    Match(score=0.94868329..., pos=2)
+    Match(score=0.89442719..., pos=0)
+    >>> [(round(score, 9), pos) for score, pos
+    ...  in index.search([2, 1], k=2, metric='euclidean')]
+    [(1.0, 2), (1.0, 4)]
+    >>> index.search([0, 0], k=1)
+    [Match(score=0.0, pos=0)]
+
+
+Scores are computed in blocks of ``block_size`` vectors, keeping only the
+best ``k`` of each block::
+
+    >>> index = VectorIndex(vectors, block_size=2)
+    >>> [pos for score, pos in index.search([2, 1], k=3)]
+    [4, 2, 0]
+
+
+Errors::
+
+    >>> VectorIndex([Vector([1, 2]), Vector([1, 2, 3])])
+    Traceback (most recent call last):
+      ...
+    ValueError: all vectors must have 2 components, got 3
+    >>> index.search([1, 2, 3])
+    Traceback (most recent call last):
+      ...
+    ValueError: query must have 2 components, got 3
+    >>> index.search([1, 2], metric='manhattan')
+    Traceback (most recent call last):
+      ...
+    ValueError: metric must be one of ('cosine', 'euclidean')
+
+
+Approximate search: ``partition`` groups the vectors around centroids
+found by k-means, then ``search`` with ``n_probe`` only scores the vectors
+of the ``n_probe`` partitions closest to the query. More probes give better
+recall and slower queries::
+
+    >>> import random
+    >>> rnd = random.Random(42)
+    >>> data = [Vector(rnd.gauss(0, 1) for i in range(8)) for n in range(500)]
+    >>> index = VectorIndex(data)
+    >>> index.partition(10, seed=42)
+    >>> len(index.lists)
+    10
+    >>> query = data[123]
+    >>> index.search(query, k=1, n_probe=1)[0].pos
+    123
+    >>> exact = index.search(query, k=20)
+    >>> index.search(query, k=20, n_probe=10) == exact
+    True
+    >>> few = index.search(query, k=20, n_probe=2)
+    >>> 0 < len(set(few) & set(exact)) <= 20
+    True
+
+The kernels use NumPy over a 2-D copy of the vectors when it is installed,
+and ``Vector.__matmul__`` otherwise.
+
+"""
+
+from array import array
+from collections import namedtuple
+import heapq
+import itertools
+import math
+import operator
+import random
+
+from vector_py3_5 import Vector
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional: fall back to Vector.__matmul__
+    numpy = None
+
+METRICS = ('cosine', 'euclidean')
+
+Match = namedtuple('Match', 'score pos')
+
+
+class VectorIndex:
+
+    def __init__(self, vectors, block_size=4096):
+        self.vectors = [v if isinstance(v, Vector) else Vector(v)
+                        for v in vectors]
+        self.block_size = block_size
+        self.dim = len(self.vectors[0]) if self.vectors else 0
+        for vector in self.vectors:
+            if len(vector) != self.dim:
+                msg = 'all vectors must have {} components, got {}'
+                raise ValueError(msg.format(self.dim, len(vector)))
+        self.norms = array('d', (abs(v) for v in self.vectors))
+        if numpy is not None and self.vectors:
+            self._matrix = numpy.vstack([v._ndarray() for v in self.vectors])
+            self._norms = numpy.frombuffer(self.norms, 'd')
+        else:
+            self._matrix = self._norms = None
+        self.centroids = self.lists = None
+
+    def __len__(self):
+        return len(self.vectors)
+
+    @staticmethod
+    def _take(ndarray, positions):
+        if isinstance(positions, range):  # a slice avoids a copy
+            return ndarray[positions.start:positions.stop]
+        return ndarray[positions]
+
+    def _dots(self, positions, query):
+        """dot products of ``query`` with the vectors at ``positions``"""
+        if self._matrix is not None:
+            rows = self._take(self._matrix, positions)
+            return rows @ numpy.frombuffer(query, 'd')
+        return [self.vectors[pos] @ query for pos in positions]
+
+    def _goodness(self, positions, query, query_norm, metric):
+        """higher is better: cosine similarity or negative distance"""
+        dots = self._dots(positions, query)
+        if self._matrix is not None:
+            norms = self._take(self._norms, positions)
+            if metric == 'cosine':
+                scale = norms * query_norm
+                return numpy.divide(dots, scale, out=numpy.zeros_like(dots),
+                                    where=scale != 0)
+            squares = norms * norms - 2 * dots + query_norm * query_norm
+            return -numpy.sqrt(numpy.maximum(squares, 0))
+        norms = (self.norms[pos] for pos in positions)
+        if metric == 'cosine':
+            return [dot / (norm * query_norm) if norm * query_norm else 0.0
+                    for dot, norm in zip(dots, norms)]
+        return [-math.sqrt(max(norm * norm - 2 * dot +
+                               query_norm * query_norm, 0))
+                for dot, norm in zip(dots, norms)]
+
+    def _blocks(self, positions):
+        for start in range(0, len(positions), self.block_size):
+            yield positions[start:start + self.block_size]
+
+    def search(self, query, k=10, metric='cosine', n_probe=None):
+        """return the ``k`` best ``Match`` tuples, best first"""
+        if metric not in METRICS:
+            raise ValueError('metric must be one of {}'.format(METRICS))
+        query = array('d', query)
+        if len(query) != self.dim:
+            msg = 'query must have {} components, got {}'
+            raise ValueError(msg.format(self.dim, len(query)))
+        query_norm = math.sqrt(sum(x * x for x in query))
+        if n_probe is None or self.lists is None:
+            positions = range(len(self))
+        else:
+            probes = self._nearest_centroids(query, n_probe)
+            positions = sorted(itertools.chain.from_iterable(
+                               self.lists[i] for i in probes))
+        best = []
+        by_goodness = operator.itemgetter(0)
+        for block in self._blocks(positions):
+            goodness = self._goodness(block, query, query_norm, metric)
+            if self._matrix is not None:
+                if len(block) > k:  # keep the k best of the block in order
+                    top = numpy.argpartition(-goodness, k)[:k]
+                    top.sort()
+                else:
+                    top = range(len(block))
+                candidates = ((goodness[i].item(), block[i]) for i in top)
+            else:
+                candidates = zip(goodness, block)
+            best = heapq.nlargest(k, itertools.chain(best, candidates),
+                                  key=by_goodness)
+        if metric == 'euclidean':
+            return [Match(-goodness, pos) for goodness, pos in best]
+        return [Match(goodness, pos) for goodness, pos in best]
+
+    def _nearest_centroids(self, query, n):
+        if self._matrix is not None:
+            deltas = self._centroid_matrix - numpy.frombuffer(query, 'd')
+            distances = (deltas * deltas).sum(axis=1)
+            return numpy.argsort(distances, kind='stable')[:n].tolist()
+        distances = ((sum((a - b) ** 2 for a, b in zip(centroid, query)), i)
+                     for i, centroid in enumerate(self.centroids))
+        return [i for distance, i in heapq.nsmallest(n, distances)]
+
+    def _assign(self, centroids):
+        """position of the nearest centroid for each vector"""
+        if self._matrix is not None:
+            matrix = numpy.array(centroids)
+            squares = (matrix * matrix).sum(axis=1)
+            distances = squares - 2 * self._matrix @ matrix.T
+            return distances.argmin(axis=1).tolist()
+        squares = [sum(x * x for x in c) for c in centroids]
+        return [min(range(len(centroids)),
+                    key=lambda i: squares[i] - 2 * (vector @ centroids[i]))
+                for vector in self.vectors]
+
+    def _group(self, centroids):
+        """lists of vector positions sharing the same nearest centroid"""
+        lists = [[] for _ in centroids]
+        for pos, nearest in enumerate(self._assign(centroids)):
+            lists[nearest].append(pos)
+        return lists
+
+    def partition(self, n_lists, iterations=10, seed=None):
+        """group vectors around ``n_lists`` k-means centroids"""
+        rnd = random.Random(seed)
+        sample = rnd.sample(range(len(self)), n_lists)
+        centroids = [list(self.vectors[pos]) for pos in sample]
+        for _ in range(iterations):
+            for i, members in enumerate(self._group(centroids)):
+                if members:  # an empty partition keeps its centroid
+                    sums = [math.fsum(column) for column in
+                            zip(*(self.vectors[pos] for pos in members))]
+                    centroids[i] = [x / len(members) for x in sums]
+        self.centroids = centroids
+        self.lists = self._group(centroids)
+        if self._matrix is not None:
+            self._centroid_matrix = numpy.array(centroids)
@@ -0,0 +1,77 @@
+"""
+Compare ``VectorIndex`` searches against a naive loop over ``v @ q``.
+
+Usage: python3 vector_index_perftest.py [num_vectors [dimensions]]
+
+Reports the average time per query in milliseconds and, for approximate
+searches, the recall: the fraction of the exact top-k that was found.
+"""
+
+import sys
+import time
+import heapq
+import random
+
+from vector_py3_5 import Vector
+from vector_index import VectorIndex
+
+NUM_QUERIES = 20
+K = 10
+
+
+def naive_search(vectors, query, k):
+    query_norm = abs(query)
+    scores = (((v @ query) / (abs(v) * query_norm), i)
+              for i, v in enumerate(vectors))
+    return [i for score, i in heapq.nlargest(k, scores)]
+
+
+def clock(label, search, queries, exact=None):
+    t0 = time.perf_counter()
+    results = [search(query) for query in queries]
+    elapsed = (time.perf_counter() - t0) / len(queries) * 1000
+    if exact is None:
+        print('{:24} {:10.2f} ms'.format(label, elapsed))
+    else:
+        found = sum(len(set(res) & set(ex)) for res, ex in zip(results, exact))
+        recall = found / (len(queries) * K)
+        print('{:24} {:10.2f} ms  recall {:.2f}'.format(label, elapsed, recall))
+    return results
+
+
+def main(num_vectors=20000, dimensions=64):
+    num_vectors, dimensions = int(num_vectors), int(dimensions)
+    rnd = random.Random(42)
+    print('Building {:,} vectors of {} dimensions'.format(num_vectors,
+                                                          dimensions))
+    vectors = [Vector(rnd.gauss(0, 1) for i in range(dimensions))
+               for n in range(num_vectors)]
+    queries = [Vector(rnd.gauss(0, 1) for i in range(dimensions))
+               for n in range(NUM_QUERIES)]
+    t0 = time.perf_counter()
+    index = VectorIndex(vectors)
+    print('Index built in {:.2f} s'.format(time.perf_counter() - t0))
+
+    def positions(matches):
+        return [pos for score, pos in matches]
+
+    exact = clock('naive loop over v @ q',
+                  lambda q: naive_search(vectors, q, K), queries)
+    clock('exact index search',
+          lambda q: positions(index.search(q, K)), queries, exact)
+
+    n_lists = max(1, int(num_vectors ** 0.5))
+    t0 = time.perf_counter()
+    index.partition(n_lists, seed=42)
+    print('Partitioned into {} lists in {:.2f} s'.format(
+          n_lists, time.perf_counter() - t0))
+    n_probe = 1
+    while n_probe <= n_lists:
+        clock('approximate, n_probe={}'.format(n_probe),
+              lambda q: positions(index.search(q, K, n_probe=n_probe)),
+              queries, exact)
+        n_probe *= 4
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
@@ -0,0 +1,184 @@
+"""
+A ``ParallelVector`` splits ``abs()``, ``@`` and ``hash()`` of very long
+vectors into chunks reduced by a pool of workers. Below
+``parallel_threshold`` components the serial ``Vector`` methods are used::
+
+    >>> ParallelVector.parallel_threshold
+    1000000
+    >>> v = ParallelVector([3, 4])
+    >>> abs(v), v @ v, hash(v) == hash(Vector([3, 4]))
+    (5.0, 25.0, True)
+
+
+Lowering the threshold forces the parallel path even for short vectors::
+
+    >>> class EagerVector(ParallelVector):
+    ...     parallel_threshold = 2
+    ...     workers = 2
+    ...
+    >>> ev, v = EagerVector(range(1, 101)), Vector(range(1, 101))
+    >>> math.isclose(abs(ev), abs(v)), hash(ev) == hash(v)
+    (True, True)
+    >>> ev @ EagerVector(range(100)) == v @ Vector(range(100))
+    True
+    >>> ev[::2] @ ev[::2] == v[::2] @ v[::2]
+    True
+    >>> math.isclose(abs(EagerVector(range(100), use_numpy=True)),
+    ...              abs(Vector(range(100))))
+    True
+    >>> vh = EagerVector([300, 400], typecode='h', use_numpy=True)
+    >>> vh @ vh == 250000, abs(vh)  # integers are summed as floats
+    (True, 500.0)
+
+Vectors stored in an ``array`` are reduced by a process pool, as the
+interpreter would run threads one at a time. A ``ParallelVector`` copies
+its components into shared memory on first use and keeps that block until
+the vector is discarded; other operands of ``@`` are copied on each call::
+
+    >>> block = ev._shared_block()
+    >>> ev @ ev == v @ v and ev._shared_block() is block
+    True
+    >>> name = block.name
+    >>> del ev, block
+    >>> shared_memory.SharedMemory(name=name)  # doctest:+ELLIPSIS
+    Traceback (most recent call last):
+      ...
+    FileNotFoundError: ...
+
+NumPy-backed vectors are reduced by threads, because NumPy releases
+the GIL while it computes a dot product. Sums may differ from the serial
+results in the last bits, since they are added in a different order.
+
+"""
+
+from concurrent import futures
+from multiprocessing import shared_memory
+import functools
+import itertools
+import math
+import operator
+import os
+import weakref
+
+from vector_py3_5 import Vector
+
+
+def _squares(chunk):
+    return sum(x * x for x in chunk)
+
+
+def _dot(chunk, other_chunk):
+    return sum(map(operator.mul, chunk, other_chunk))
+
+
+def _xor_hashes(chunk):
+    return functools.reduce(operator.xor, map(hash, chunk), 0)
+
+
+KERNELS = {'squares': _squares, 'dot': _dot, 'hash': _xor_hashes}
+
+
+def _run_chunk(kernel, names, typecode, start, stop):
+    """apply a kernel to ``[start:stop]`` of shared memory blocks"""
+    blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    chunks = [block.buf.cast(typecode)[start:stop] for block in blocks]
+    try:
+        return KERNELS[kernel](*chunks)
+    finally:
+        for chunk in chunks:
+            chunk.release()
+        for block in blocks:
+            block.close()
+
+
+def _ndarray_dot(a, b, start, stop):
+    """dot product of two NumPy slices; NumPy releases the GIL here"""
+    a, b = a[start:stop], b[start:stop]
+    return float(a.astype('d', copy=False) @ b.astype('d', copy=False))
+
+
+def _to_shared(components, size):
+    """copy ``size`` items of ``components`` into new shared memory"""
+    data = memoryview(components)[:size]
+    if not data.c_contiguous:  # a stepped slice
+        data = memoryview(data.tobytes())
+    data = data.cast('B')
+    block = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+    block.buf[:len(data)] = data
+    return block
+
+
+def _release(block):
+    block.close()
+    block.unlink()
+
+
+@functools.lru_cache()
+def _executor(kind, workers):
+    if kind == 'process':
+        return futures.ProcessPoolExecutor(workers)
+    return futures.ThreadPoolExecutor(workers)
+
+
+class ParallelVector(Vector):
+    parallel_threshold = 10**6
+    workers = os.cpu_count()
+
+    def _ranges(self, size):
+        step = -(-size // self.workers)  # ceiling division
+        return [(start, min(start + step, size))
+                for start in range(0, size, step)]
+
+    def _parallel_reduce(self, kernel, vectors, size, combine):
+        typecode = self.typecode
+        if kernel != 'hash' and all(v._vectorized for v in vectors):
+            executor = _executor('thread', self.workers)
+            a = vectors[0]._components
+            b = vectors[-1]._components  # a again, for squares
+            starts, stops = zip(*self._ranges(size))
+            results = executor.map(_ndarray_dot, itertools.repeat(a),
+                                   itertools.repeat(b), starts, stops)
+            return functools.reduce(combine, results)
+        executor = _executor('process', self.workers)
+        blocks = [v._shared_block() if isinstance(v, ParallelVector)
+                  else _to_shared(v._components, size) for v in vectors]
+        try:
+            names = [block.name for block in blocks]
+            jobs = [executor.submit(_run_chunk, kernel, names,
+                                    typecode, start, stop)
+                    for start, stop in self._ranges(size)]
+            return functools.reduce(combine, (job.result() for job in jobs))
+        finally:
+            for v, block in zip(vectors, blocks):
+                if not isinstance(v, ParallelVector):
+                    _release(block)
+
+    def _shared_block(self):
+        """shared memory copy of the components, made on first use"""
+        block = getattr(self, '_block', None)
+        if block is None:  # safe to keep: instances are immutable
+            block = _to_shared(self._components, len(self))
+            weakref.finalize(self, _release, block)
+            self._block = block
+        return block
+
+    def __abs__(self):
+        if self._norm is None and len(self) >= self.parallel_threshold:
+            squares = self._parallel_reduce('squares', [self], len(self),
+                                            operator.add)
+            self._norm = math.sqrt(squares)
+        return super().__abs__()
+
+    def __hash__(self):
+        if self._hash is None and len(self) >= self.parallel_threshold:
+            self._hash = self._parallel_reduce('hash', [self], len(self),
+                                               operator.xor)
+        return super().__hash__()
+
+    def __matmul__(self, other):
+        if (isinstance(other, Vector) and other.typecode == self.typecode and
+                min(len(self), len(other)) >= self.parallel_threshold):
+            size = min(len(self), len(other))  # same as zip
+            return self._parallel_reduce('dot', [self, other], size,
+                                         operator.add)
+        return super().__matmul__(other)
@@ -0,0 +1,50 @@
+"""
+Time ``abs()``, ``@`` and ``hash()`` of a long ``ParallelVector`` with
+1, 2, 4... workers, up to the number of CPUs, against the serial methods
+of ``Vector``.
+
+Usage: python3 vector_parallel_perftest.py [num_components]
+"""
+
+import os
+import sys
+import time
+
+from vector_py3_5 import Vector
+from vector_parallel import ParallelVector
+
+TESTS = [
+    ('abs', lambda v: abs(v)),
+    ('@  ', lambda v: v @ v),
+    ('hash', lambda v: hash(v)),
+]
+
+
+def clock(vector_cls, size, **attrs):
+    cls = type('Timed' + vector_cls.__name__, (vector_cls,), attrs)
+    times = []
+    for label, func in TESTS:
+        vector = cls(range(size))  # a new vector: nothing cached
+        t0 = time.perf_counter()
+        func(vector)
+        times.append(time.perf_counter() - t0)
+    return times
+
+
+def main(size=10**7):
+    size = int(size)
+    print('{:,} components; times in seconds'.format(size))
+    print('{:12}'.format(''), *('{:>8}'.format(label) for label, _ in TESTS))
+    serial = clock(Vector, size)
+    print('{:12}'.format('serial'), *('{:8.3f}'.format(t) for t in serial))
+    workers = 1
+    while workers <= os.cpu_count():
+        times = clock(ParallelVector, size, workers=workers,
+                      parallel_threshold=1)
+        label = '{} worker{}'.format(workers, 's' if workers > 1 else '')
+        print('{:12}'.format(label), *('{:8.3f}'.format(t) for t in times))
+        workers *= 2
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
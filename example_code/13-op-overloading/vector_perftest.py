@@ -0,0 +1,52 @@
+"""
+Compare ``Vector`` equality and addition against the generator-based
+implementations they replaced, for vectors of 10, 10**3 and 10**6
+dimensions.
+
+Usage: python3 vector_perftest.py [vector-module]
+
+The default module is ``vector_py3_5``; times are microseconds per call.
+"""
+
+import sys
+import timeit
+
+SETUP = '''
+import itertools
+from {module} import Vector
+va = Vector(range({size}))
+vb = Vector(range({size}))
+vc = Vector(range({size} // 2))
+
+def generator_eq(a, b):
+    return len(a) == len(b) and all(x == y for x, y in zip(a, b))
+
+def generator_add(a, b):
+    pairs = itertools.zip_longest(a, b, fillvalue=0.0)
+    return Vector(x + y for x, y in pairs)
+'''
+
+TESTS = [
+    ('== generators', 'generator_eq(va, vb)'),
+    ('== buffers   ', 'va == vb'),
+    ('+  generators', 'generator_add(va, vc)'),
+    ('+  map       ', 'va + vc'),
+]
+
+SIZES = [10, 10**3, 10**6]
+
+
+def test(module):
+    print('{:13}'.format(module), *('{:>12,}'.format(size) for size in SIZES))
+    for label, stmt in TESTS:
+        times = []
+        for size in SIZES:
+            number = max(1, 10**5 // size)
+            setup = SETUP.format(module=module, size=size)
+            tt = timeit.repeat(stmt, setup, repeat=3, number=number)
+            times.append(min(tt) / number * 10**6)
+        print(label, *('{:12.2f}'.format(t) for t in times))
+
+
+if __name__ == '__main__':
+    test(sys.argv[1] if len(sys.argv) > 1 else 'vector_py3_5')
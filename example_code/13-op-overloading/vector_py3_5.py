@@ -300,6 +300,138 @@ Tests for operator `@` (Python >= 3.5), computing the dot product::
     TypeError: unsupported operand type(s) for @: 'Vector' and 'int'
 
 
+Slices are views sharing the components of the sliced vector; only
+``Vector(view)`` copies them::
+
+    >>> v10 = Vector(range(10))
+    >>> evens = v10[::2]
+    >>> evens, evens[1:3], evens[-1], evens.x
+    (Vector([0.0, 2.0, 4.0, 6.0, 8.0]), Vector([2.0, 4.0]), 8.0, 0.0)
+    >>> isinstance(evens._components, memoryview)
+    True
+    >>> bytes(evens) == bytes(Vector([0, 2, 4, 6, 8]))
+    True
+    >>> evens == Vector([0, 2, 4, 6, 8]), abs(evens[3:]), evens @ evens
+    (True, 10.0, 120.0)
+    >>> evens + evens, evens * 2
+    (Vector([0.0, 4.0, 8.0, 12.0, 16.0]), Vector([0.0, 4.0, 8.0, 12.0, 16.0]))
+    >>> format(v10[::-3], '.1f')
+    '(9.0, 6.0, 3.0, 0.0)'
+    >>> copy = Vector(evens)
+    >>> copy == evens, isinstance(copy._components, memoryview)
+    (True, False)
+
+Pickling or copying a view copies its components into a new array::
+
+    >>> import pickle, copy
+    >>> pickle.loads(pickle.dumps(evens)), copy.deepcopy(v10[-2:])
+    (Vector([0.0, 2.0, 4.0, 6.0, 8.0]), Vector([8.0, 9.0]))
+    >>> vh = Vector(range(5), typecode='h')[1:3]
+    >>> restored = pickle.loads(pickle.dumps(vh))
+    >>> restored, isinstance(restored._components, array)
+    (Vector([1, 2], typecode='h'), True)
+
+
+Tests of compact storage with other typecodes, chosen at construction
+or by subclasses::
+
+    >>> vf = Vector([1.5, 2.25], typecode='f')
+    >>> vf
+    Vector([1.5, 2.25], typecode='f')
+    >>> bytes(vf)
+    b'f\\x00\\x00\\xc0?\\x00\\x00\\x10@'
+    >>> Vector.frombytes(bytes(vf))
+    Vector([1.5, 2.25], typecode='f')
+    >>> vf == Vector([1.5, 2.25]), vf + vf, vf * 2
+    (True, Vector([3.0, 4.5], typecode='f'), Vector([3.0, 4.5], typecode='f'))
+    >>> class ShortVector(Vector):
+    ...     typecode = 'h'
+    ...
+    >>> vh = ShortVector([3, 4])
+    >>> vh, abs(vh), hash(vh) == hash(Vector([3, 4]))
+    (Vector([3, 4], typecode='h'), 5.0, True)
+    >>> len(bytes(vh)), len(bytes(Vector([3, 4])))
+    (5, 17)
+    >>> vh[1:], vh.y
+    (Vector([4], typecode='h'), 4)
+    >>> vh + vh, vh * 2
+    (Vector([6, 8], typecode='h'), Vector([6, 8], typecode='h'))
+    >>> vh + vf, vh * 0.5  # mixing with floats gives float vectors
+    (Vector([4.5, 6.25]), Vector([1.5, 2.0]))
+    >>> format(vh), format(vh, '.3fh')
+    ('(3, 4)', '<5.000, 0.927>')
+    >>> Vector([3, 4], typecode='h', use_numpy=True) * 2
+    Vector([6, 8], typecode='h')
+
+
+Integer results that do not fit the typecode are stored as floats, with
+both storages::
+
+    >>> big = Vector([30000], typecode='h')
+    >>> big + big, big * 2, Vector([1], typecode='B') * -1
+    (Vector([60000.0]), Vector([60000.0]), Vector([-1.0]))
+    >>> nbig = Vector([30000], typecode='h', use_numpy=True)
+    >>> nbig + nbig, nbig * 2, Vector([200], typecode='B', use_numpy=True) * 2
+    (Vector([60000.0]), Vector([60000.0]), Vector([400.0]))
+    >>> nbig + Vector([-30000], typecode='h', use_numpy=True)
+    Vector([0], typecode='h')
+
+Norms and dot products of integer vectors are summed as floats::
+
+    >>> for use_numpy in False, True:
+    ...     v = Vector([300, 400], typecode='h', use_numpy=use_numpy)
+    ...     print(abs(v), v @ v == 250000, format(v, '.3fh'))
+    ...
+    500.0 True <500.000, 0.927>
+    500.0 True <500.000, 0.927>
+
+
+Tests of cached norm and hash, computed only once per instance::
+
+    >>> v = Vector(range(10**5))
+    >>> abs(v) is abs(v), hash(v) is hash(v)
+    (True, True)
+    >>> hash(v) == hash(Vector(range(10**5)))
+    True
+
+
+All angles are computed in a single pass over the components::
+
+    >>> v5 = Vector([-1, 2, -3, 4, -5])
+    >>> all(math.isclose(a, v5.angle(n))
+    ...     for n, a in enumerate(v5.angles(), 1))
+    True
+    >>> sum(1 for a in v.angles())
+    99999
+
+
+Tests of NumPy storage, selected per instance or per class (the same
+results are produced with ``array`` storage if NumPy is not installed)::
+
+    >>> vn = Vector([3, 4, 5], use_numpy=True)
+    >>> vn
+    Vector([3.0, 4.0, 5.0])
+    >>> vn == Vector([3, 4, 5])
+    True
+    >>> bytes(vn) == bytes(Vector([3, 4, 5]))
+    True
+    >>> abs(Vector([3, 4], use_numpy=True))
+    5.0
+    >>> vn + Vector([1, 2]), vn * 10
+    (Vector([4.0, 6.0, 5.0]), Vector([30.0, 40.0, 50.0]))
+    >>> vn @ Vector([5, 6, 7])
+    74.0
+    >>> vn[1], vn[1:], vn.z
+    (4.0, Vector([4.0, 5.0]), 5.0)
+    >>> class NumpyVector(Vector):
+    ...     use_numpy = True
+    ...
+    >>> format(NumpyVector([1, 1, 1]), '.3eh')
+    '<1.732e+00, 9.553e-01, 7.854e-01>'
+    >>> NumpyVector.frombytes(bytes(vn)) == vn
+    True
+
+
 """
 
 from array import array
@@ -309,20 +441,99 @@ import functools
 import operator
 import itertools
 import numbers
+import collections.abc
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional: fall back to array storage
+    numpy = None
+
+
+FLOAT_TYPECODES = 'fd'
+EXACT_FLOAT_INT = 2**53  # larger ints may not survive a trip through 'd'
+
+
+def _as_ndarray(typecode, components):
+    if isinstance(components, Vector):
+        components = components._components
+    if isinstance(components, collections.abc.Iterator):
+        return numpy.fromiter(components, dtype=typecode)
+    return numpy.array(components, dtype=typecode)
+
+
+def _narrow(result, typecode):
+    """float ndarray ``result`` stored with integer ``typecode`` if all its
+    values fit, else kept as floats"""
+    info = numpy.iinfo(typecode)
+    low = max(info.min, -EXACT_FLOAT_INT)
+    high = min(info.max, EXACT_FLOAT_INT)
+    if len(result) and (result.min() < low or result.max() > high):
+        return result
+    return result.astype(typecode)
 
 
 class Vector:
     typecode = 'd'
+    use_numpy = False  # override in a subclass to store components in NumPy
+
+    def __init__(self, components, use_numpy=None, typecode=None):
+        if typecode is not None:
+            self.typecode = typecode
+        if use_numpy is None:
+            use_numpy = self.use_numpy
+        if use_numpy and numpy is not None:
+            self._components = _as_ndarray(self.typecode, components)
+        else:
+            self._components = array(self.typecode, components)
+        self._norm = self._hash = None  # computed on first use
 
-    def __init__(self, components):
-        self._components = array(self.typecode, components)
+    @classmethod
+    def _wrap(cls, components):
+        """build an instance sharing ``components``, without copying"""
+        vector = cls.__new__(cls)
+        vector._components = components
+        if isinstance(components, array):
+            typecode = components.typecode
+        elif isinstance(components, memoryview):  # a slice of a Vector
+            typecode = components.format
+        else:
+            typecode = components.dtype.char
+        if typecode != vector.typecode:
+            vector.typecode = typecode
+        vector._norm = vector._hash = None
+        return vector
+
+    @property
+    def _vectorized(self):
+        return numpy is not None and isinstance(self._components,
+                                                numpy.ndarray)
+
+    def _ndarray(self):
+        return numpy.asarray(self._components)
+
+    def _float_ndarray(self):
+        """components as float64, so sums of integer products can't wrap"""
+        return numpy.asarray(self._components, dtype='d')
+
+    def __reduce__(self):
+        components = self._components
+        if isinstance(components, memoryview):  # a view: not picklable
+            components = array(self.typecode, components)
+        return type(self), (components, self._vectorized, self.typecode)
 
     def __iter__(self):
+        if self._vectorized:
+            return iter(self._components.tolist())
         return iter(self._components)
 
     def __repr__(self):
-        components = reprlib.repr(self._components)
+        components = self._components
+        if not isinstance(components, array):  # reprlib shows 5 items
+            components = array(self.typecode, components[:6].tolist())
+        components = reprlib.repr(components)
         components = components[components.find('['):-1]
+        if self.typecode != Vector.typecode:
+            components += ', typecode={!r}'.format(self.typecode)
         return 'Vector({})'.format(components)
 
     def __str__(self):
@@ -334,17 +545,35 @@ class Vector:
 
     def __eq__(self, other):
         if isinstance(other, Vector):
-            return (len(self) == len(other) and
-                    all(a == b for a, b in zip(self, other)))
+            if len(self) != len(other):
+                return False
+            if (self._hash is not None and other._hash is not None and
+                    self._hash != other._hash):
+                return False
+            if self._vectorized or other._vectorized:
+                return bool(numpy.array_equal(self._ndarray(),
+                                              other._ndarray()))
+            # compare the buffers in C, without building float objects
+            return (memoryview(self._components) ==
+                    memoryview(other._components))
         else:
             return NotImplemented
 
     def __hash__(self):
-        hashes = (hash(x) for x in self)
-        return functools.reduce(operator.xor, hashes, 0)
+        if self._hash is None:  # safe to cache: instances are immutable
+            hashes = (hash(x) for x in self)
+            self._hash = functools.reduce(operator.xor, hashes, 0)
+        return self._hash
 
     def __abs__(self):
-        return math.sqrt(sum(x * x for x in self))
+        if self._norm is None:
+            if self._vectorized:
+                components = self._float_ndarray()
+                squares = numpy.dot(components, components)
+            else:
+                squares = sum(x * x for x in self)
+            self._norm = math.sqrt(squares)
+        return self._norm
 
     def __bool__(self):
         return bool(abs(self))
@@ -354,9 +583,14 @@ class Vector:
 
     def __getitem__(self, index):
         cls = type(self)
-        if isinstance(index, slice):
-            return cls(self._components[index])
+        if isinstance(index, slice):  # a view sharing the components
+            if self._vectorized:
+                return cls._wrap(self._components[index])
+            memv = memoryview(self._components).toreadonly()
+            return cls._wrap(memv[index])
         elif isinstance(index, int):
+            if self._vectorized:
+                return self._components[index].item()
             return self._components[index]
         else:
             msg = '{.__name__} indices must be integers'
@@ -369,20 +603,37 @@ class Vector:
         if len(name) == 1:
             pos = cls.shortcut_names.find(name)
             if 0 <= pos < len(self._components):
-                return self._components[pos]
+                return self[pos]
         msg = '{.__name__!r} object has no attribute {!r}'
         raise AttributeError(msg.format(cls, name))
 
     def angle(self, n):
-        r = math.sqrt(sum(x * x for x in self[n:]))
+        r = abs(self[n:])
         a = math.atan2(r, self[n-1])
         if (n == len(self) - 1) and (self[-1] < 0):
             return math.pi * 2 - a
         else:
             return a
 
+    def _tail_norms(self):
+        """list where item ``n`` is ``abs(self[n:])``, built in one pass"""
+        if self._vectorized:
+            reversed_squares = self._float_ndarray()[::-1] ** 2
+            return numpy.sqrt(numpy.cumsum(reversed_squares)[::-1]).tolist()
+        squares = (x * x for x in reversed(self._components))
+        tails = list(itertools.accumulate(squares))
+        tails.reverse()
+        return [math.sqrt(x) for x in tails]
+
     def angles(self):
-        return (self.angle(n) for n in range(1, len(self)))
+        if len(self) < 2:
+            return
+        components = list(self)
+        tails = self._tail_norms()
+        for n in range(1, len(components) - 1):
+            yield math.atan2(tails[n], components[n-1])
+        a = math.atan2(tails[-1], components[-2])
+        yield math.pi * 2 - a if components[-1] < 0 else a
 
     def __format__(self, fmt_spec=''):
         if fmt_spec.endswith('h'):  # hyperspherical coordinates
@@ -400,21 +651,69 @@ class Vector:
     def frombytes(cls, octets):
         typecode = chr(octets[0])
         memv = memoryview(octets[1:]).cast(typecode)
-        return cls(memv)
+        return cls(memv, typecode=typecode)
 
     def __add__(self, other):
+        if isinstance(other, Vector) and (self._vectorized or
+                                          other._vectorized):
+            longer, shorter = self._ndarray(), other._ndarray()
+            if len(longer) < len(shorter):
+                longer, shorter = shorter, longer
+            typecode = self._typecode_with(other)
+            if typecode in FLOAT_TYPECODES:
+                result = longer.astype(typecode)  # a copy
+                result[:len(shorter)] += shorter
+            else:  # add as floats: NumPy integer sums wrap around
+                result = longer.astype('d')
+                result[:len(shorter)] += shorter
+                result = _narrow(result, typecode)
+            return Vector._wrap(result)
+        if isinstance(other, Vector) and other.typecode == self.typecode:
+            longer, shorter = self._components, other._components
+            if len(longer) < len(shorter):
+                longer, shorter = shorter, longer
+            try:
+                result = array(self.typecode,
+                               map(operator.add, longer, shorter))
+                result.extend(longer[len(shorter):])  # no padding with 0.0
+            except OverflowError:  # integer sums too large for the typecode
+                result = array('d', map(operator.add, longer, shorter))
+                result.extend(map(float, longer[len(shorter):]))
+            return Vector._wrap(result)
         try:
             pairs = itertools.zip_longest(self, other, fillvalue=0.0)
-            return Vector(a + b for a, b in pairs)
+            return Vector((a + b for a, b in pairs),
+                          typecode=self._typecode_with(other))
         except TypeError:
             return NotImplemented
 
+    def _typecode_with(self, other):
+        """typecode for results combining ``self`` and ``other``:
+        integer typecodes are kept only with same-typecode vectors or
+        integer scalars, else results are stored as floats (``'d'``).
+        Integer results that overflow the typecode are also stored as
+        floats."""
+        if isinstance(other, Vector) and other.typecode == self.typecode:
+            return self.typecode
+        if self.typecode in FLOAT_TYPECODES:
+            return self.typecode if isinstance(other, numbers.Real) else 'd'
+        return self.typecode if isinstance(other, numbers.Integral) else 'd'
+
     def __radd__(self, other):
         return self + other
 
     def __mul__(self, scalar):
         if isinstance(scalar, numbers.Real):
-            return Vector(n * scalar for n in self)
+            typecode = self._typecode_with(scalar)
+            if self._vectorized:
+                result = self._components * float(scalar)
+                if typecode not in FLOAT_TYPECODES:  # products as floats
+                    return Vector._wrap(_narrow(result, typecode))
+                return Vector._wrap(result.astype(typecode, copy=False))
+            try:
+                return Vector((n * scalar for n in self), typecode=typecode)
+            except OverflowError:  # integer products too large
+                return Vector((n * scalar for n in self), typecode='d')
         else:
             return NotImplemented
 
@@ -422,6 +721,11 @@ class Vector:
         return self * scalar
 
     def __matmul__(self, other):
+        if isinstance(other, Vector) and (self._vectorized or
+                                          other._vectorized):
+            size = min(len(self), len(other))  # same as zip
+            return float(numpy.dot(self._float_ndarray()[:size],
+                                   other._float_ndarray()[:size]))
         try:
             return sum(a * b for a, b in zip(self, other))
         except TypeError:
@@ -294,6 +294,50 @@ Tests of operator `!=`::
     >>> va != (1, 2, 3)
     True
 
+
+Tests of cached norm and hash, computed only once per instance::
+
+    >>> v = Vector(range(10**5))
+    >>> abs(v) is abs(v), hash(v) is hash(v)
+    (True, True)
+    >>> hash(v) == hash(Vector(range(10**5)))
+    True
+
+
+All angles are computed in a single pass over the components::
+
+    >>> v5 = Vector([-1, 2, -3, 4, -5])
+    >>> all(math.isclose(a, v5.angle(n))
+    ...     for n, a in enumerate(v5.angles(), 1))
+    True
+    >>> sum(1 for a in v.angles())
+    99999
+
+
+Tests of NumPy storage, selected per instance or per class (the same
+results are produced with ``array`` storage if NumPy is not installed)::
+
+    >>> vn = Vector([3, 4, 5], use_numpy=True)
+    >>> vn
+    Vector([3.0, 4.0, 5.0])
+    >>> vn == Vector([3, 4, 5])
+    True
+    >>> bytes(vn) == bytes(Vector([3, 4, 5]))
+    True
+    >>> abs(Vector([3, 4], use_numpy=True))
+    5.0
+    >>> vn + Vector([1, 2]), vn * 10, -vn
+    (Vector([4.0, 6.0, 5.0]), Vector([30.0, 40.0, 50.0]), Vector([-3.0, -4.0, -5.0]))
+    >>> vn[1], vn[1:], vn.z
+    (4.0, Vector([4.0, 5.0]), 5.0)
+    >>> class NumpyVector(Vector):
+    ...     use_numpy = True
+    ...
+    >>> format(NumpyVector([1, 1, 1]), '.3eh')
+    '<1.732e+00, 9.553e-01, 7.854e-01>'
+    >>> NumpyVector.frombytes(bytes(vn)) == vn
+    True
+
 """
 
 from array import array
@@ -303,19 +347,61 @@ import numbers
 import functools
 import operator
 import itertools
+import collections.abc
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional: fall back to array storage
+    numpy = None
+
+
+def _as_ndarray(typecode, components):
+    if isinstance(components, Vector):
+        components = components._components
+    if isinstance(components, collections.abc.Iterator):
+        return numpy.fromiter(components, dtype=typecode)
+    return numpy.array(components, dtype=typecode)
 
 
 class Vector:
     typecode = 'd'
+    use_numpy = False  # override in a subclass to store components in NumPy
 
-    def __init__(self, components):
-        self._components = array(self.typecode, components)
+    def __init__(self, components, use_numpy=None):
+        if use_numpy is None:
+            use_numpy = self.use_numpy
+        if use_numpy and numpy is not None:
+            self._components = _as_ndarray(self.typecode, components)
+        else:
+            self._components = array(self.typecode, components)
+        self._norm = self._hash = None  # computed on first use
+
+    @classmethod
+    def _wrap(cls, components):
+        """build an instance sharing ``components``, without copying"""
+        vector = cls.__new__(cls)
+        vector._components = components
+        vector._norm = vector._hash = None
+        return vector
+
+    @property
+    def _vectorized(self):
+        return numpy is not None and isinstance(self._components,
+                                                numpy.ndarray)
+
+    def _ndarray(self):
+        return numpy.asarray(self._components)
 
     def __iter__(self):
+        if self._vectorized:
+            return iter(self._components.tolist())
         return iter(self._components)
 
     def __repr__(self):
-        components = reprlib.repr(self._components)
+        components = self._components
+        if self._vectorized:  # reprlib shows at most 5 items of an array
+            components = array(self.typecode, components[:6].tolist())
+        components = reprlib.repr(components)
         components = components[components.find('['):-1]
         return 'Vector({})'.format(components)
 
@@ -329,23 +415,41 @@ class Vector:
 # BEGIN VECTOR_V8_EQ
     def __eq__(self, other):
         if isinstance(other, Vector):  # <1>
-            return (len(self) == len(other) and
-                    all(a == b for a, b in zip(self, other)))
+            if len(self) != len(other):
+                return False
+            if self._vectorized or other._vectorized:
+                return bool(numpy.array_equal(self._ndarray(),
+                                              other._ndarray()))
+            # compare the buffers in C, without building float objects
+            return (memoryview(self._components) ==
+                    memoryview(other._components))
         else:
             return NotImplemented  # <2>
 # END VECTOR_V8_EQ
 
     def __hash__(self):
-        hashes = (hash(x) for x in self)
-        return functools.reduce(operator.xor, hashes, 0)
+        if self._hash is None:  # safe to cache: instances are immutable
+            hashes = (hash(x) for x in self)
+            self._hash = functools.reduce(operator.xor, hashes, 0)
+        return self._hash
 
     def __abs__(self):
-        return math.sqrt(sum(x * x for x in self))
+        if self._norm is None:
+            if self._vectorized:
+                squares = numpy.dot(self._components, self._components)
+            else:
+                squares = sum(x * x for x in self)
+            self._norm = math.sqrt(squares)
+        return self._norm
 
     def __neg__(self):
+        if self._vectorized:
+            return Vector._wrap(-self._components)
         return Vector(-x for x in self)
 
     def __pos__(self):
+        if self._vectorized:
+            return Vector._wrap(self._components.copy())
         return Vector(self)
 
     def __bool__(self):
@@ -357,8 +461,12 @@ class Vector:
     def __getitem__(self, index):
         cls = type(self)
         if isinstance(index, slice):
+            if self._vectorized:
+                return cls._wrap(self._components[index].copy())
             return cls(self._components[index])
         elif isinstance(index, numbers.Integral):
+            if self._vectorized:
+                return self._components[index].item()
             return self._components[index]
         else:
             msg = '{.__name__} indices must be integers'
@@ -371,20 +479,37 @@ class Vector:
         if len(name) == 1:
             pos = cls.shortcut_names.find(name)
             if 0 <= pos < len(self._components):
-                return self._components[pos]
+                return self[pos]
         msg = '{.__name__!r} object has no attribute {!r}'
         raise AttributeError(msg.format(cls, name))
 
     def angle(self, n):
-        r = math.sqrt(sum(x * x for x in self[n:]))
+        r = abs(self[n:])
         a = math.atan2(r, self[n-1])
         if (n == len(self) - 1) and (self[-1] < 0):
             return math.pi * 2 - a
         else:
             return a
 
+    def _tail_norms(self):
+        """list where item ``n`` is ``abs(self[n:])``, built in one pass"""
+        if self._vectorized:
+            reversed_squares = self._components[::-1] ** 2
+            return numpy.sqrt(numpy.cumsum(reversed_squares)[::-1]).tolist()
+        squares = (x * x for x in reversed(self._components))
+        tails = list(itertools.accumulate(squares))
+        tails.reverse()
+        return [math.sqrt(x) for x in tails]
+
     def angles(self):
-        return (self.angle(n) for n in range(1, len(self)))
+        if len(self) < 2:
+            return
+        components = list(self)
+        tails = self._tail_norms()
+        for n in range(1, len(components) - 1):
+            yield math.atan2(tails[n], components[n-1])
+        a = math.atan2(tails[-1], components[-2])
+        yield math.pi * 2 - a if components[-1] < 0 else a
 
     def __format__(self, fmt_spec=''):
         if fmt_spec.endswith('h'):  # hyperspherical coordinates
@@ -405,6 +530,21 @@ class Vector:
         return cls(memv)
 
     def __add__(self, other):
+        if isinstance(other, Vector) and (self._vectorized or
+                                          other._vectorized):
+            longer, shorter = self._ndarray(), other._ndarray()
+            if len(longer) < len(shorter):
+                longer, shorter = shorter, longer
+            result = longer.astype(self.typecode)  # always a copy
+            result[:len(shorter)] += shorter
+            return Vector._wrap(result)
+        if isinstance(other, Vector) and other.typecode == self.typecode:
+            longer, shorter = self._components, other._components
+            if len(longer) < len(shorter):
+                longer, shorter = shorter, longer
+            result = array(self.typecode, map(operator.add, longer, shorter))
+            result.extend(longer[len(shorter):])  # no padding with 0.0
+            return Vector._wrap(result)
         try:
             pairs = itertools.zip_longest(self, other, fillvalue=0.0)
             return Vector(a + b for a, b in pairs)
@@ -416,6 +556,8 @@ class Vector:
 
     def __mul__(self, scalar):
         if isinstance(scalar, numbers.Real):
+            if self._vectorized:
+                return Vector._wrap(self._components * float(scalar))
             return Vector(n * scalar for n in self)
         else:
             return NotImplemented
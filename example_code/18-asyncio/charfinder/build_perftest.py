@@ -0,0 +1,41 @@
+"""
+Time building the ``UnicodeNameIndex`` of all Unicode characters serially
+and with process pools of different sizes, and check they are the same.
+
+Usage: python3 build_perftest.py [workers]...
+
+The default is to compare 1 (serial), 2 and ``os.cpu_count()`` workers.
+"""
+
+import os
+import sys
+import time
+import unicodedata
+
+from charfinder import UnicodeNameIndex, sample_chars
+
+
+def build(workers):
+    index = UnicodeNameIndex(sample_chars)
+    t0 = time.perf_counter()
+    index.build_index(workers=workers)
+    return time.perf_counter() - t0, index.index
+
+
+def main(worker_counts):
+    print('Unicode {}, {} CPUs'.format(unicodedata.unidata_version,
+                                       os.cpu_count()))
+    serial_time, serial_index = build(1)
+    print('{:>7} {:8.2f}s'.format('serial', serial_time))
+    for workers in worker_counts:
+        elapsed, index = build(workers)
+        check = 'same' if index == serial_index else 'DIFFERENT'
+        print('{:7} {:8.2f}s {:6.2f}x  {}'.format(
+              workers, elapsed, serial_time / elapsed, check))
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        main([int(arg) for arg in sys.argv[1:]])
+    else:
+        main(sorted({2, os.cpu_count() or 1}))
@@ -56,22 +56,38 @@ codepoint at the end of the name.
 """
 
 import sys
+import os
 import re
+import glob
+import bisect
 import unicodedata
-import pickle
 import warnings
 import itertools
-import functools
+import heapq
+import multiprocessing
+from array import array
 from collections import namedtuple
+from concurrent import futures
+
+from index_file import save_index, load_index, DescriptionTable
 
 RE_WORD = re.compile(r'\w+')
 RE_UNICODE_NAME = re.compile('^[A-Z0-9 -]+$')
 RE_CODEPOINT = re.compile('U\+([0-9A-F]{4,6})')
 
-INDEX_NAME = 'charfinder_index.pickle'
+INDEX_PATTERN = 'charfinder_index-{}.idx'  # formatted with a Unicode version
+INDEX_NAME = INDEX_PATTERN.format(unicodedata.unidata_version)
 MINIMUM_SAVE_LEN = 10000
+FIRST_CODEPOINT = 32
+PAGE_LIMIT = 100  # results per page, when paginating
+BUILD_CHUNKS = 64  # codepoint ranges indexed by a process pool
+POSTING_TYPECODE = 'I'  # codepoints, as stored by index_file
+GALLOP_RATIO = 20  # gallop when one posting list is this many times longer
 CJK_UNI_PREFIX = 'CJK UNIFIED IDEOGRAPH'
 CJK_CMP_PREFIX = 'CJK COMPATIBILITY IDEOGRAPH'
+# saved in index files: indexes built with other parameters are not used
+BUILD_PARAMS = {'first_codepoint': FIRST_CODEPOINT, 'word_re': RE_WORD.pattern,
+                'collapsed_prefixes': [CJK_UNI_PREFIX, CJK_CMP_PREFIX]}
 
 sample_chars = [
     '$',  # DOLLAR SIGN
@@ -92,6 +108,135 @@ def tokenize(text):
         yield match.group().upper()
 
 
+def describe_line(code_str, char, name):
+    return '{:7}\t{}\t{}'.format(code_str, char, name)
+
+
+def description_item(char, name):
+    """(codepoint, description line, rank) for the description table"""
+    line = describe_line('U+{:04X}'.format(ord(char)), char, name)
+    rank = len(RE_WORD.findall(name))  # shorter names rank first
+    return ord(char), line.encode(), rank
+
+
+def name_words(name):
+    """the words of ``name`` that are indexed"""
+    if name.startswith(CJK_UNI_PREFIX):
+        name = CJK_UNI_PREFIX
+    elif name.startswith(CJK_CMP_PREFIX):
+        name = CJK_CMP_PREFIX
+    return set(tokenize(name))
+
+
+def index_meta():
+    """metadata saved with the index: what it was built from, and how"""
+    return {'unicode_version': unicodedata.unidata_version,
+            'params': BUILD_PARAMS}
+
+
+def index_chars(chars):
+    """map words to codepoints of the ``chars`` with them in their names;
+    return that and (codepoint, description line, rank) triples for them"""
+    index = {}
+    lines = []
+    for char in chars:
+        try:
+            name = unicodedata.name(char)
+        except ValueError:
+            continue
+        lines.append(description_item(char, name))
+        for word in name_words(name):
+            index.setdefault(word, []).append(ord(char))
+    return index, lines
+
+
+def rank(groups, ranks, k=sys.maxsize):
+    """the first ``k`` codepoints of ``groups``, the lowest ``ranks`` first
+    within each group; groups after the first ``k`` results are not read
+
+    >>> ranks = {36: 2, 65: 4, 97: 4, 8364: 2}  # DOLLAR SIGN, LATIN...
+    >>> groups = [[65, 97, 8364], [36]]
+    >>> rank(groups, ranks), rank(groups, ranks, 2)
+    ([8364, 65, 97, 36], [8364, 65])
+    """
+    ranked = []
+    for group in groups:
+        if len(ranked) >= k:
+            break
+        # nsmallest is stable: equal ranks stay in codepoint order
+        ranked.extend(heapq.nsmallest(k - len(ranked), group,
+                                      key=ranks.__getitem__))
+    return ranked
+
+
+def index_range(start, stop):
+    """``index_chars`` for a range of codepoints, run by worker processes"""
+    return index_chars(map(chr, range(start, stop)))
+
+
+def page_range(page=None, limit=None):
+    """``start, stop`` arguments for ``find_chars`` to get results on
+    ``page``, counting from 1; all results if neither ``page`` nor
+    ``limit`` are given, the first page if only ``limit`` is
+
+    >>> page_range(), page_range(1), page_range(3, 10), page_range(0, 10)
+    ((0, None), (0, 100), (20, 30), (0, 10))
+    >>> page_range(limit=10)
+    (0, 10)
+    """
+    if page is None:
+        if limit is None:
+            return 0, None
+        page = 1
+    limit = PAGE_LIMIT if limit is None else max(limit, 1)
+    start = (max(page, 1) - 1) * limit
+    return start, start + limit
+
+
+def gallop(postings, target, lo=0):
+    """position of the first item >= ``target`` in sorted ``postings``,
+    searching from ``lo`` with exponentially growing steps"""
+    step = 1
+    hi = lo + step
+    while hi < len(postings) and postings[hi] < target:
+        lo = hi
+        step *= 2
+        hi = lo + step
+    return bisect.bisect_left(postings, target, lo, min(hi, len(postings)))
+
+
+def intersect(short, long):
+    """sorted codepoints in both sorted arrays ``short`` and ``long``"""
+    if len(long) < GALLOP_RATIO * len(short):  # scanning in C is faster
+        return array(POSTING_TYPECODE, filter(set(short).__contains__, long))
+    result = array(POSTING_TYPECODE)
+    pos = 0
+    for codepoint in short:
+        pos = gallop(long, codepoint, pos)
+        if pos == len(long):
+            break
+        if long[pos] == codepoint:
+            result.append(codepoint)
+    return result
+
+
+class WordIndex(dict):
+    """words mapped to sorted codepoint arrays, as built in memory"""
+
+    def prefix_items(self, prefix):
+        """(word, codepoints) pairs for the words starting with ``prefix``"""
+        if getattr(self, '_sorted_words', None) is None:
+            self._sorted_words = sorted(self)
+        pos = bisect.bisect_left(self._sorted_words, prefix)
+        words = itertools.takewhile(lambda word: word.startswith(prefix),
+                                    self._sorted_words[pos:])
+        return [(word, self[word]) for word in words]
+
+    def counts(self):
+        """(word, number of codepoints) pairs"""
+        return ((word, len(codepoints)) for word, codepoints in self.items())
+
+
 def query_type(text):
     text_upper = text.upper()
     if 'U+' in text_upper:
@@ -104,86 +249,237 @@ def query_type(text):
 
 class UnicodeNameIndex:
 
-    def __init__(self, chars=None):
-        self.load(chars)
+    def __init__(self, chars=None, workers=1):
+        self.load(chars, workers)
 
-    def load(self, chars=None):
+    def load(self, chars=None, workers=1):
+        """use the saved index of this Unicode version, else update the
+        index of another version, else index ``chars`` or all of Unicode
+        with ``workers`` processes"""
         self.index = None
         if chars is None:
             try:
-                with open(INDEX_NAME, 'rb') as fp:
-                    self.index = pickle.load(fp)
-            except OSError:
+                index = load_index(INDEX_NAME)  # memory-mapped
+            except (OSError, ValueError):
                 pass
+            else:
+                if index.meta == index_meta():  # else: stale, rebuild
+                    self.index = index
+                    self.descriptions = index.descriptions
         if self.index is None:
-            self.build_index(chars)
-        if len(self.index) > MINIMUM_SAVE_LEN:
-            try:
-                self.save()
-            except OSError as exc:
-                warnings.warn('Could not save {!r}: {}'
-                              .format(INDEX_NAME, exc))
+            base = self.find_base() if chars is None else None
+            if base is None:
+                self.build_index(chars, workers)
+            else:
+                self.update_index(base)
+            if len(self.index) > MINIMUM_SAVE_LEN:
+                try:
+                    self.save()
+                except OSError as exc:
+                    warnings.warn('Could not save {!r}: {}'
+                                  .format(INDEX_NAME, exc))
 
     def save(self):
-        with open(INDEX_NAME, 'wb') as fp:
-            pickle.dump(self.index, fp)
+        save_index(INDEX_NAME, self.index, self.descriptions, index_meta())
+
+    @staticmethod
+    def find_base():
+        """the newest saved index of another Unicode version built with the
+        same parameters, or ``None``"""
+        paths = glob.glob(INDEX_PATTERN.format('*'))
+        paths.sort(key=os.path.getmtime, reverse=True)
+        for path in paths:
+            if os.path.abspath(path) == os.path.abspath(INDEX_NAME):
+                continue
+            try:
+                index = load_index(path)
+            except (OSError, ValueError):
+                continue
+            if index.meta.get('params') == BUILD_PARAMS:
+                return index
+        return None
 
-    def build_index(self, chars=None):
+    def build_index(self, chars=None, workers=1):
+        """index ``chars``, or all of Unicode with ``workers`` processes;
+        serial by default, as ``load`` may run while a module is imported"""
         if chars is None:
-            chars = (chr(i) for i in range(32, sys.maxunicode))
+            partials = self._index_all(workers)
+        else:
+            partials = [index_chars(chars)]
         index = {}
-        for char in chars:
-            try:
-                name = unicodedata.name(char)
-            except ValueError:
+        lines = []
+        for partial, partial_lines in partials:
+            for word, codepoints in partial.items():
+                index.setdefault(word, []).extend(codepoints)
+            lines.extend(partial_lines)
+
+        self.index = WordIndex((word, array(POSTING_TYPECODE, sorted(cps)))
+                               for word, cps in index.items())
+        lines.sort()
+        self.descriptions = DescriptionTable.fromlines(lines)
+
+    def update_index(self, base):
+        """index all of Unicode starting from ``base``, an index of another
+        Unicode version: only chars with new or changed names are indexed
+        again. Return how many there were."""
+        old_lines = base.descriptions
+        lines = []
+        changed = 0
+        removed = {}  # word -> codepoints
+        added = {}
+        for codepoint in range(FIRST_CODEPOINT, sys.maxunicode):
+            char = chr(codepoint)
+            name = unicodedata.name(char, None)
+            line = old_lines.get(codepoint)
+            if line is None and name is None:
                 continue
-            if name.startswith(CJK_UNI_PREFIX):
-                name = CJK_UNI_PREFIX
-            elif name.startswith(CJK_CMP_PREFIX):
-                name = CJK_CMP_PREFIX
-
-            for word in tokenize(name):
-                index.setdefault(word, set()).add(char)
-
-        self.index = index
+            # lines end with '\t' and the name: compare them as bytes
+            if name is not None and line is not None and line.endswith(
+                    b'\t' + name.encode()):
+                lines.append((codepoint, line, old_lines.ranks[codepoint]))
+                continue
+            changed += 1
+            if line is not None:
+                old_name = line.rpartition(b'\t')[2].decode()
+                for word in name_words(old_name):
+                    removed.setdefault(word, []).append(codepoint)
+            if name is not None:
+                lines.append(description_item(char, name))
+                for word in name_words(name):
+                    added.setdefault(word, []).append(codepoint)
+
+        index = dict(base.prefix_items(''))  # all words, without lookups
+        for word in removed.keys() | added.keys():
+            codepoints = set(index.get(word, ()))
+            codepoints.difference_update(removed.get(word, ()))
+            codepoints.update(added.get(word, ()))
+            if codepoints:
+                index[word] = sorted(codepoints)
+            else:
+                del index[word]
+
+        self.index = WordIndex((word, array(POSTING_TYPECODE, cps))
+                               for word, cps in index.items())
+        self.descriptions = DescriptionTable.fromlines(lines)
+        return changed
+
+    @staticmethod
+    def _index_all(workers=1):
+        """partial indexes of all codepoints, in codepoint order"""
+        first, last = FIRST_CODEPOINT, sys.maxunicode
+        # spawned processes would import ``__main__`` again, and a server
+        # script builds its index when it runs: only forked ones are used
+        forking = 'fork' in multiprocessing.get_all_start_methods()
+        if workers <= 1 or not forking:
+            return [index_range(first, last)]
+        step = -(-(last - first) // BUILD_CHUNKS)  # ceiling division
+        starts = range(first, last, step)
+        stops = [min(start + step, last) for start in starts]
+        context = multiprocessing.get_context('fork')
+        with futures.ProcessPoolExecutor(workers, context) as executor:
+            return list(executor.map(index_range, starts, stops))
 
     def word_rank(self, top=None):
-        res = [(len(self.index[key]), key) for key in self.index]
-        res.sort(key=lambda item: (-item[0], item[1]))
-        if top is not None:
-            res = res[:top]
-        return res
+        res = ((count, key) for key, count in self.index.counts())
+        order = lambda item: (-item[0], item[1])
+        if top is None:
+            return sorted(res, key=order)
+        return heapq.nsmallest(top, res, key=order)  # the top, in order
 
     def word_report(self, top=None):
         for postings, key in self.word_rank(top):
             print('{:5} {}'.format(postings, key))
 
-    def find_chars(self, query, start=0, stop=None):
-        stop = sys.maxsize if stop is None else stop
-        result_sets = []
-        for word in tokenize(query):
-            chars = self.index.get(word)
-            if chars is None:  # shorcut: no such word
-                result_sets = []
+    def _prefix_postings(self, prefix):
+        """sorted codepoints of all words starting with ``prefix``"""
+        items = self.index.prefix_items(prefix)
+        if len(items) < 2:
+            return items[0][1] if items else None
+        union = set()
+        for word, codepoints in items:
+            union.update(codepoints)
+        return array(POSTING_TYPECODE, sorted(union))
+
+    def _intersect_postings(self, words, prefix=False):
+        """sorted codepoints matching all ``words``, or ``None``"""
+        postings = []
+        for word in words:
+            if prefix:
+                codepoints = self._prefix_postings(word)
+            else:
+                codepoints = self.index.get(word)
+            if codepoints is None:  # shorcut: no such word
+                return None
+            postings.append(codepoints)
+
+        if not postings:
+            return None
+
+        postings.sort(key=len)  # smallest first: the result only shrinks
+        result = postings[0]
+        for codepoints in postings[1:]:
+            if not result:
                 break
-            result_sets.append(chars)
+            result = intersect(result, codepoints)
+        return result
 
-        if not result_sets:
+    def estimate_cost(self, query, prefix=False):
+        """number of postings ``find_chars`` would read for ``query``"""
+        cost = 0
+        for word in tokenize(query):
+            if prefix:
+                cost += sum(len(codepoints) for word, codepoints
+                            in self.index.prefix_items(word))
+            else:
+                cost += len(self.index.get(word, ()))
+        return cost
+
+    def find_chars(self, query, start=0, stop=None, prefix=False,
+                   ranked=False):
+        """chars with all words of ``query`` in their names, by codepoint
+
+        With ``prefix=True``, each word of ``query`` also matches the words
+        starting with it; chars matching all words exactly come first.
+        With ``ranked=True``, chars with fewer words in their names come
+        first, and only the first ``stop`` results are ranked.
+        """
+        stop = sys.maxsize if stop is None else stop
+        words = list(tokenize(query))
+        result = self._intersect_postings(words, prefix)
+        if not result:
             return QueryResult(0, ())
-
-        result = functools.reduce(set.intersection, result_sets)
-        result = sorted(result)  # must sort to support start, stop
+        count = len(result)
+        groups = [result]
+        if prefix:
+            exact = self._intersect_postings(words)
+            if exact and len(exact) < len(result):  # exact first
+                others = itertools.filterfalse(set(exact).__contains__,
+                                               result)
+                groups = [exact, others]
+        if ranked:
+            result = rank(groups, self.descriptions.ranks, stop)
+        elif len(groups) > 1:
+            result = itertools.chain(*groups)
+        # already sorted: only the chars in [start:stop] are built
         result_iter = itertools.islice(result, start, stop)
-        return QueryResult(len(result),
-                           (char for char in result_iter))
+        return QueryResult(count, map(chr, result_iter))
+
+    def describe_bytes(self, char):
+        """description line of ``char``, UTF-8 encoded: a slice of the
+        precomputed table, unless ``char`` was not indexed"""
+        line = self.descriptions.get(ord(char))
+        if line is None:
+            code_str = 'U+{:04X}'.format(ord(char))
+            line = describe_line(code_str, char, unicodedata.name(char))
+            line = line.encode()
+        return line
 
     def describe(self, char):
-        code_str = 'U+{:04X}'.format(ord(char))
-        name = unicodedata.name(char)
-        return CharDescription(code_str, char, name)
+        code_str, char, name = self.describe_bytes(char).decode().split('\t')
+        return CharDescription(code_str.rstrip(), char, name)
 
-    def find_descriptions(self, query, start=0, stop=None):
-        for char in self.find_chars(query, start, stop).items:
+    def find_descriptions(self, query, start=0, stop=None, prefix=False):
+        for char in self.find_chars(query, start, stop, prefix).items:
             yield self.describe(char)
 
     def get_descriptions(self, chars):
@@ -191,10 +487,11 @@ class UnicodeNameIndex:
             yield self.describe(char)
 
     def describe_str(self, char):
-        return '{:7}\t{}\t{}'.format(*self.describe(char))
+        return self.describe_bytes(char).decode()
 
-    def find_description_strs(self, query, start=0, stop=None):
-        for char in self.find_chars(query, start, stop).items:
+    def find_description_strs(self, query, start=0, stop=None,
+                              prefix=False):
+        for char in self.find_chars(query, start, stop, prefix).items:
             yield self.describe_str(char)
 
     @staticmethod  # not an instance method due to concurrency
@@ -1,54 +1,102 @@
 #!/usr/bin/env python3
 
+import os
 import sys
 import asyncio
+import html
+from urllib.parse import urlencode
 from aiohttp import web
 
-from charfinder import UnicodeNameIndex
+from charfinder import UnicodeNameIndex, page_range
+from query_cache import QueryCache, query_key
 
 TEMPLATE_NAME = 'http_charfinder.html'
 CONTENT_TYPE = 'text/html; charset=UTF-8'
+TEXT_TYPE = 'text/plain; charset=UTF-8'
 SAMPLE_WORDS = ('bismillah chess cat circled Malayalam digit'
                 ' Roman face Ethiopic black mark symbol dot'
                 ' operator Braille hexagram').split()
 
 ROW_TPL = '<tr><td>{code_str}</td><th>{char}</th><td>{name}</td></tr>'
 LINK_TPL = '<a href="/?query={0}" title="find &quot;{0}&quot;">{0}</a>'
+NEXT_TPL = '<a href="/?{}">next page</a>'
+ROW_BYTES_TPL = (ROW_TPL + '\n').format(  # rows are built from bytes
+    code_str='%s', char='%s', name='%s').encode()
 LINKS_HTML = ', '.join(LINK_TPL.format(word) for word in
                        sorted(SAMPLE_WORDS, key=str.upper))
 
 
-index = UnicodeNameIndex()
+# run as a script, a missing index is built with all CPUs; imported, serially
+BUILD_WORKERS = (os.cpu_count() or 1) if __name__ == '__main__' else 1
+index = UnicodeNameIndex(workers=BUILD_WORKERS)
+cache = QueryCache()
 with open(TEMPLATE_NAME) as tpl:
     template = tpl.read()
 template = template.replace('{links}', LINKS_HTML)
+template_head, template_tail = template.split('{result}')
+template_tail = template_tail.encode()
+
+
+def int_param(request, name):
+    try:
+        return int(request.GET[name])
+    except (KeyError, ValueError):
+        return None
+
+
+def encode_row(char):
+    code_str, char, name = index.describe_bytes(char).split(b'\t')
+    return ROW_BYTES_TPL % (code_str.rstrip(), char, name)
+
 
 # BEGIN HTTP_CHARFINDER_HOME
+@asyncio.coroutine
 def home(request):  # <1>
     query = request.GET.get('query', '').strip()  # <2>
-    print('Query: {!r}'.format(query))  # <3>
+    start, stop = page_range(int_param(request, 'page'),
+                             int_param(request, 'limit'))
+    print('Query: {!r} [{}:{}]'.format(query, start, stop))  # <3>
     if query:  # <4>
-        descriptions = list(index.find_descriptions(query))
-        res = '\n'.join(ROW_TPL.format(**descr._asdict())
-                        for descr in descriptions)
-        msg = index.status(query, len(descriptions))
+        count, chunks = cache.fetch(
+            query_key(query, start, stop, 'html'),
+            lambda: index.find_chars(query, start, stop, prefix=True,
+                                     ranked=True),
+            encode_row)
+        msg = index.status(query, count)
+        if stop is not None and stop < count:
+            limit = stop - start
+            params = urlencode(dict(query=query, page=stop // limit + 1,
+                                    limit=limit))
+            msg += ' ' + NEXT_TPL.format(html.escape(params))
     else:
-        descriptions = []
-        res = ''
+        chunks = ()
         msg = 'Enter words describing characters.'
 
-    html = template.format(query=query, result=res,  # <5>
-                           message=msg)
-    print('Sending {} results'.format(len(descriptions)))  # <6>
-    return web.Response(content_type=CONTENT_TYPE, text=html) # <7>
+    response = web.StreamResponse()
+    response.headers['Content-Type'] = CONTENT_TYPE
+    response.start(request)  # no Content-Length: the body is chunked
+    head = template_head.format(query=query, message=msg)  # <5>
+    response.write(head.encode())
+    for chunk in chunks:
+        yield from response.write(chunk)  # waits if the client is slow
+    response.write(template_tail)
+    yield from response.write_eof()
+    print('Sent results for {!r}'.format(query))  # <6>
+    return response  # <7>
 # END HTTP_CHARFINDER_HOME
 
 
+def stats(request):
+    text = 'Query cache: {}\n'.format(cache.stats())
+    return web.Response(content_type=TEXT_TYPE, text=text)
+
+
 # BEGIN HTTP_CHARFINDER_SETUP
 @asyncio.coroutine
 def init(loop, address, port):  # <1>
     app = web.Application(loop=loop)  # <2>
     app.router.add_route('GET', '/', home)  # <3>
+    app.router.add_route('GET', '/stats', stats)
     handler = app.make_handler()  # <4>
     server = yield from loop.create_server(handler,
                                            address, port)  # <5>
@@ -0,0 +1,283 @@
+"""
+Word index files for ``charfinder``, memory-mapped when loaded.
+
+An index file maps each word to the sorted codepoints of the characters
+with that word in their names, and has a table of description lines for
+those characters. It starts with a 24-byte header: the magic bytes
+``b'CFIX'``, a format version, the size of the metadata, the number of
+words, the total number of postings, ``limit``, one more than the highest
+described codepoint, and a CRC-32 checksum of the rest of the file.
+Eight sections follow:
+
+* metadata: a JSON object, padded with spaces to a multiple of 4 bytes;
+* word offsets: ``words + 1`` unsigned ints, into the words section;
+* posting offsets: ``words + 1`` unsigned ints, into the postings section;
+* postings: the codepoints of each word, as unsigned ints;
+* description offsets: ``limit + 1`` unsigned ints, indexed by codepoint,
+  into the description lines section;
+* words: all words, UTF-8 encoded and sorted, without separators;
+* description lines: UTF-8 encoded, without separators;
+* ranks: ``limit`` unsigned bytes, indexed by codepoint, to order results.
+
+::
+
+    >>> import os, tempfile
+    >>> path = os.path.join(tempfile.mkdtemp(), 'demo.idx')
+    >>> save_index(path, {'SIGN': [36, 8364], 'DOLLAR': [36]})
+    2
+    >>> index = load_index(path)
+    >>> len(index), list(index)
+    (2, ['DOLLAR', 'SIGN'])
+    >>> index['SIGN'].tolist()
+    [36, 8364]
+    >>> index.get('EURO') is None, 'DOLLAR' in index
+    (True, True)
+    >>> [word for word, codepoints in index.prefix_items('S')]
+    ['SIGN']
+
+A ``DescriptionTable`` holds one line of text and a rank per codepoint;
+``get`` returns the line as bytes, ready to be sent, without searching::
+
+    >>> table = DescriptionTable.fromlines([(36, b'DOLLAR SIGN', 2),
+    ...                                     (8364, b'EURO SIGN', 2)])
+    >>> table.limit, table.get(36), table.get(37), table.get(9999)
+    (8365, b'DOLLAR SIGN', None, None)
+    >>> table.ranks[36], table.ranks[37]
+    (2, 0)
+    >>> save_index(path, {'DOLLAR': [36]}, table, {'unicode_version': '9.0'})
+    1
+    >>> index = load_index(path)
+    >>> index.descriptions.get(8364), index.meta
+    (b'EURO SIGN', {'unicode_version': '9.0'})
+
+``load_index`` maps the file read-only instead of reading it, so every
+process using the same file shares its pages. ``save_index`` writes a new
+file and renames it over ``path``, because truncating a file mapped by
+another process would crash that process.
+
+``load_index`` reads the mapped file through once, to verify its
+checksum, and rejects files that are not complete indexes::
+
+    >>> with open(path, 'r+b') as fp:  # change the last byte
+    ...     __ = fp.seek(-1, os.SEEK_END)
+    ...     __ = fp.write(b'X')
+    ...
+    >>> load_index(path)  # doctest:+ELLIPSIS
+    Traceback (most recent call last):
+      ...
+    ValueError: '...demo.idx' is corrupt: bad checksum
+    >>> with open(path, 'wb') as fp:
+    ...     fp.write(b'not an index')
+    ...
+    12
+    >>> load_index(path)  # doctest:+ELLIPSIS
+    Traceback (most recent call last):
+      ...
+    ValueError: '...demo.idx' is not a charfinder index file
+
+"""
+
+from array import array
+import collections.abc
+import itertools
+import json
+import mmap
+import operator
+import os
+import struct
+import zlib
+
+MAGIC = b'CFIX'
+FORMAT_VERSION = 4
+HEADER = struct.Struct('=4sHHIIII')  # magic, version, metadata size,
+                                     # words, postings, description limit,
+                                     # checksum
+TYPECODE = 'I'
+
+
+def save_index(path, index, descriptions=None, meta=None):
+    """write ``index``, a mapping of words to sorted codepoints, a
+    ``DescriptionTable`` and ``meta``, a dict of JSON values, to ``path``;
+    return the number of words written"""
+    if descriptions is None:
+        descriptions = DescriptionTable.fromlines([])
+    meta = json.dumps(meta or {}, sort_keys=True).encode()
+    meta += b' ' * (-len(meta) % 4)  # keep the tables aligned
+    words = sorted(word.encode() for word in index)
+    word_offsets = array(TYPECODE, [0])
+    posting_offsets = array(TYPECODE, [0])
+    postings = array(TYPECODE)
+    for word in words:
+        word_offsets.append(word_offsets[-1] + len(word))
+        postings.extend(index[word.decode()])
+        posting_offsets.append(len(postings))
+    tmp_path = path + '.tmp'
+    sections = [meta, word_offsets, posting_offsets, postings,
+                descriptions._offsets, b''.join(words),
+                descriptions.lines_bytes(), descriptions.ranks]
+    checksum = 0
+    for section in sections:
+        checksum = zlib.crc32(section, checksum)
+    with open(tmp_path, 'wb') as fp:
+        fp.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(meta), len(words),
+                             len(postings), descriptions.limit, checksum))
+        for section in sections:
+            fp.write(section)
+    os.replace(tmp_path, path)
+    return len(words)
+
+
+def load_index(path):
+    """return a ``MappedIndex`` backed by a read-only map of ``path``"""
+    with open(path, 'rb') as fp:
+        if os.fstat(fp.fileno()).st_size < HEADER.size:
+            raise ValueError(
+                '{!r} is not a charfinder index file'.format(path))
+        octets = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, *counts, checksum = HEADER.unpack_from(octets)
+    if magic != MAGIC:
+        raise ValueError('{!r} is not a charfinder index file'.format(path))
+    if version != FORMAT_VERSION:
+        msg = '{!r} has format version {}, expected {}'
+        raise ValueError(msg.format(path, version, FORMAT_VERSION))
+    meta_size, words, postings, limit = counts
+    tables_size = 2 * (words + 1) + postings + limit + 1
+    if len(octets) < (HEADER.size + meta_size +
+                      tables_size * array(TYPECODE).itemsize):
+        raise ValueError('{!r} is truncated'.format(path))
+    index = MappedIndex(octets, *counts)
+    descriptions = index.descriptions
+    if len(octets) < descriptions._base + descriptions.size + limit:
+        raise ValueError('{!r} is truncated'.format(path))
+    if zlib.crc32(memoryview(octets)[HEADER.size:]) != checksum:
+        raise ValueError('{!r} is corrupt: bad checksum'.format(path))
+    return index
+
+
+class DescriptionTable:
+    """lines of text by codepoint: the line of codepoint ``cp`` is at
+    ``offsets[cp]:offsets[cp + 1]`` in a buffer of UTF-8 encoded lines
+    starting at ``base``; codepoints without a line have empty slices.
+    ``ranks[cp]`` is a small int to order results, 0 without a line"""
+
+    def __init__(self, offsets, ranks, buffer, base=0):
+        self._offsets = offsets
+        self.ranks = ranks
+        self._buffer = buffer
+        self._base = base
+        self.limit = len(offsets) - 1
+
+    @classmethod
+    def fromlines(cls, items):
+        """build from (codepoint, line, rank) triples, sorted by codepoint"""
+        offsets = array(TYPECODE, [0])
+        ranks = bytearray()
+        lines = []
+        for codepoint, line, rank in items:
+            missing = codepoint + 1 - len(offsets)
+            offsets.extend(itertools.repeat(offsets[-1], missing))
+            ranks.extend(bytes(missing))
+            offsets.append(offsets[-1] + len(line))
+            ranks.append(rank)
+            lines.append(line)
+        return cls(offsets, bytes(ranks), b''.join(lines))
+
+    @property
+    def size(self):
+        """bytes used by the lines"""
+        return self._offsets[-1]
+
+    def lines_bytes(self):
+        return self._buffer[self._base:self._base + self.size]
+
+    def get(self, codepoint, default=None):
+        """the line for ``codepoint``, as bytes, or ``default``"""
+        if codepoint >= self.limit:
+            return default
+        start = self._offsets[codepoint]
+        stop = self._offsets[codepoint + 1]
+        if start == stop:
+            return default
+        return self._buffer[self._base + start:self._base + stop]
+
+
+class MappedIndex(collections.abc.Mapping):
+    """read-only mapping of words to memoryviews of sorted codepoints"""
+
+    def __init__(self, octets, meta_size, words, postings, limit):
+        self._octets = octets
+        itemsize = array(TYPECODE).itemsize
+        memv = memoryview(octets)
+        start = HEADER.size + meta_size
+        self.meta = json.loads(octets[HEADER.size:start].decode())
+        sections = []
+        for size in (words + 1, words + 1, postings, limit + 1):
+            stop = start + size * itemsize
+            sections.append(memv[start:stop].cast(TYPECODE))
+            start = stop
+        (self._word_offsets, self._posting_offsets,
+         self._postings, description_offsets) = sections
+        self._words_start = start
+        lines_start = start + self._word_offsets[-1]
+        ranks_start = lines_start + description_offsets[-1]
+        ranks = memv[ranks_start:ranks_start + limit]
+        self.descriptions = DescriptionTable(description_offsets, ranks,
+                                             octets, lines_start)
+
+    def _word(self, pos):
+        start, stop = self._word_offsets[pos:pos + 2]
+        return self._octets[self._words_start + start:
+                            self._words_start + stop]
+
+    def _bisect(self, key):
+        """position of the first word >= ``key``, comparing UTF-8 bytes"""
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._word(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _find(self, word):
+        """position of ``word`` in the sorted words, or -1"""
+        key = word.encode()
+        pos = self._bisect(key)
+        if pos < len(self) and self._word(pos) == key:
+            return pos
+        return -1
+
+    def _posting(self, pos):
+        offsets = self._posting_offsets
+        return self._postings[offsets[pos]:offsets[pos + 1]]
+
+    def prefix_items(self, prefix):
+        """(word, codepoints) pairs for the words starting with ``prefix``"""
+        key = prefix.encode()
+        pos = self._bisect(key)
+        items = []
+        while pos < len(self):
+            word = self._word(pos)
+            if not word.startswith(key):
+                break
+            items.append((word.decode(), self._posting(pos)))
+            pos += 1
+        return items
+
+    def counts(self):
+        """(word, number of codepoints) pairs, without looking words up"""
+        offsets = self._posting_offsets
+        return zip(self, map(operator.sub, offsets[1:], offsets[:-1]))
+
+    def __getitem__(self, word):
+        pos = self._find(word) if isinstance(word, str) else -1
+        if pos < 0:
+            raise KeyError(word)
+        return self._posting(pos)
+
+    def __iter__(self):
+        return (self._word(pos).decode() for pos in range(len(self)))
+
+    def __len__(self):
+        return len(self._word_offsets) - 1
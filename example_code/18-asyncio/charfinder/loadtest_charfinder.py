@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+
+"""
+Load test for ``prefork_charfinder``: for each number of workers, start
+the server, run client processes sending queries for a few seconds, and
+report the throughput.
+
+Usage: python3 loadtest_charfinder.py [workers]...
+
+The default is to test 1, 2 and ``os.cpu_count()`` workers. Queries ask
+for random pages of broad prefix searches, so they miss the query cache
+and each one intersects large posting lists.
+"""
+
+import multiprocessing
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+ADDRESS = '127.0.0.1'
+PORT = 2324
+CLIENTS = 8
+DURATION = 5  # seconds per test
+QUERIES = ['cjk ide', 'letter', 'small lat', 'sign', 'arro', 'c']
+PROMPT = b'?> '
+
+
+def run_client(seed):
+    """send queries until ``DURATION`` elapses; return how many"""
+    rnd = random.Random(seed)
+    with socket.create_connection((ADDRESS, PORT)) as sock:
+        sock_file = sock.makefile('rb')
+
+        def read_until_prompt():
+            data = b''
+            while not data.endswith(PROMPT):
+                chunk = sock_file.read1(2**16)
+                if not chunk:
+                    raise ConnectionError('server closed the connection')
+                data += chunk
+            return data
+
+        read_until_prompt()
+        count = 0
+        deadline = time.monotonic() + DURATION
+        while time.monotonic() < deadline:
+            query = '{} @{}/10'.format(rnd.choice(QUERIES),
+                                       rnd.randrange(1, 1000))
+            sock.sendall(query.encode() + b'\r\n')
+            read_until_prompt()
+            count += 1
+        sock.sendall(b'\x00\r\n')
+    return count
+
+
+def wait_for_server(timeout=60):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            socket.create_connection((ADDRESS, PORT)).close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(.2)
+
+
+def load_test(workers):
+    server = subprocess.Popen(
+        [sys.executable, 'prefork_charfinder.py', ADDRESS, str(PORT),
+         str(workers)], stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    try:
+        wait_for_server()
+        with multiprocessing.Pool(CLIENTS) as pool:
+            t0 = time.perf_counter()
+            counts = pool.map(run_client, range(CLIENTS))
+            elapsed = time.perf_counter() - t0
+    finally:
+        server.send_signal(signal.SIGTERM)
+        output, __ = server.communicate()
+    report = [line for line in output.decode().splitlines()
+              if line.startswith(('worker', 'total'))]
+    return sum(counts) / elapsed, report
+
+
+def main(worker_counts):
+    print('{} clients, {}s per test, {} CPUs'.format(CLIENTS, DURATION,
+                                                     os.cpu_count()))
+    base_rate = None
+    for workers in worker_counts:
+        rate, report = load_test(workers)
+        base_rate = base_rate or rate
+        print('{:3} workers: {:8.1f} queries/s {:6.2f}x'.format(
+              workers, rate, rate / base_rate))
+        for line in report:
+            print('    ' + line)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        main([int(arg) for arg in sys.argv[1:]])
+    else:
+        main(sorted({1, 2, os.cpu_count() or 1}))
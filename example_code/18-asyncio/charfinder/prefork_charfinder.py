@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+
+"""
+Pre-fork ``tcp_charfinder`` server: N worker processes, each running an
+asyncio event loop, accept connections on the same port.
+
+Usage: python3 prefork_charfinder.py [address [port [workers]]]
+
+The index is loaded before forking, memory-mapped, so all workers read
+the same pages of ``INDEX_NAME``; if that file is missing, it is built with
+all CPUs and saved first. Where ``SO_REUSEPORT`` is available
+each worker binds its own listening socket and the kernel spreads new
+connections among them; otherwise the workers share one socket.
+
+CTRL-C or ``SIGTERM`` stops the workers gracefully: they stop accepting,
+give connected clients ``SHUTDOWN_TIMEOUT`` seconds to finish, and report
+how many queries they answered.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import time
+
+from charfinder import UnicodeNameIndex
+
+tcp_charfinder = None  # imported by main, once the index file is saved
+
+SHUTDOWN_TIMEOUT = 5  # seconds
+REUSE_PORT = hasattr(socket, 'SO_REUSEPORT')
+
+
+def listening_socket(address, port):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if REUSE_PORT:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((address, port))
+    sock.listen(socket.SOMAXCONN)
+    return sock
+
+
+def serve(worker_id, address, port, sock, query_counts):
+    """run one worker until it gets SIGINT or SIGTERM"""
+    if sock is None:
+        sock = listening_socket(address, port)
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    clients = set()
+
+    @asyncio.coroutine
+    def handle_client(reader, writer):
+        clients.add(writer)
+        try:
+            yield from tcp_charfinder.handle_queries(reader, writer)
+        finally:
+            clients.discard(writer)
+
+    server = loop.run_until_complete(
+        asyncio.start_server(handle_client, sock=sock))
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, loop.stop)
+    try:
+        loop.run_forever()
+    finally:
+        server.close()  # stop accepting, then let clients finish
+        deadline = time.monotonic() + SHUTDOWN_TIMEOUT
+        while clients and time.monotonic() < deadline:
+            loop.run_until_complete(asyncio.sleep(.1))
+        for writer in clients:
+            writer.close()
+        loop.run_until_complete(server.wait_closed())
+        loop.close()
+        tcp_charfinder.runner.shutdown()
+        query_counts[worker_id] = tcp_charfinder.counter['queries']
+
+
+def main(address='127.0.0.1', port=2323, workers=None):
+    global tcp_charfinder
+    port = int(port)
+    workers = int(workers or os.cpu_count() or 1)
+    UnicodeNameIndex(workers=os.cpu_count() or 1)  # builds and saves it
+    import tcp_charfinder  # maps the saved index, to share it when forking
+    context = multiprocessing.get_context('fork')
+    sock = None if REUSE_PORT else listening_socket(address, port)
+    query_counts = context.Array('q', workers)
+    processes = [context.Process(target=serve,
+                                 args=(i, address, port, sock, query_counts))
+                 for i in range(workers)]
+    for process in processes:
+        process.start()
+    mode = 'SO_REUSEPORT' if REUSE_PORT else 'a shared socket'
+    print('Serving on {}:{} with {} workers using {}. Hit CTRL-C to stop.'
+          .format(address, port, workers, mode))
+
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:  # CTRL+C pressed, or SIGTERM
+        pass
+
+    print('Server shutting down.')
+    for process in processes:
+        if process.is_alive():
+            process.terminate()  # SIGTERM: a graceful stop
+        process.join()
+    for i, (process, count) in enumerate(zip(processes, query_counts)):
+        print('worker {} (pid {}): {} queries'.format(i, process.pid, count))
+    print('total: {} queries'.format(sum(query_counts)))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
@@ -0,0 +1,141 @@
+"""
+Bounded LRU cache of encoded query results, shared by the ``charfinder``
+servers.
+
+Keys are built by ``query_key``, so queries with the same words in any
+order or case share an entry::
+
+    >>> query_key('Black rook', 0, None) == query_key('ROOK  black', 0, None)
+    True
+    >>> cache = QueryCache(max_size=100)
+    >>> key = query_key('rook', 0, 10, 'text')
+    >>> cache.get(key) is None
+    True
+    >>> cache.put(key, 2, b'ROOKS' * 12)  # doctest:+ELLIPSIS
+    CachedResult(count=2, octets=b'ROOKSROOKS...')
+    >>> cache.get(key).count, len(cache.get(key).octets)
+    (2, 60)
+    >>> __ = cache.put(query_key('pawn', 0, 10, 'text'), 2, b'y' * 60)
+    >>> cache.get(key) is None  # evicted: 120 bytes do not fit in 100
+    True
+    >>> __ = cache.put(query_key('king', 0, 10, 'text'), 1, b'z' * 200)
+    >>> cache.stats()
+    CacheStats(hits=2, misses=2, evictions=1, entries=1, size=60)
+
+
+Only the size of the encoded results counts towards ``max_size``; results
+larger than ``max_size`` are not stored.
+
+``fetch`` returns the count and an iterator over chunks of encoded
+results, so servers can send the first chunk before the others are
+encoded. On a miss it calls ``find()`` for a ``QueryResult``, and stores
+the chunks once the iterator is exhausted::
+
+    >>> from charfinder import QueryResult
+    >>> def find():
+    ...     print('searching')
+    ...     return QueryResult(5, iter('abcde'))
+    ...
+    >>> key = query_key('letters', 0, None)
+    >>> count, chunks = cache.fetch(key, find, str.encode, chunk_len=2)
+    searching
+    >>> count, list(chunks)
+    (5, [b'ab', b'cd', b'e'])
+    >>> count, chunks = cache.fetch(key, find, str.encode)
+    >>> count, list(chunks)
+    (5, [b'abcde'])
+
+"""
+
+import collections
+import itertools
+
+from charfinder import tokenize
+
+DEFAULT_MAX_SIZE = 2**24  # bytes
+CHUNK_LEN = 100  # results encoded per chunk
+CHUNK_SIZE = 2**16  # bytes per chunk when replaying a cached result
+
+CacheStats = collections.namedtuple(
+    'CacheStats', 'hits misses evictions entries size')
+
+CachedResult = collections.namedtuple('CachedResult', 'count octets')
+
+
+def query_key(query, start, stop, kind=''):
+    """normalized cache key: the set of query words and the page range"""
+    words = tuple(sorted(set(tokenize(query))))
+    return words, start, stop, kind
+
+
+class QueryCache:
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE):
+        self.max_size = max_size
+        self._results = collections.OrderedDict()
+        self._size = 0
+        self._counts = collections.Counter()
+
+    def __contains__(self, key):  # no effect on stats or LRU order
+        return key in self._results
+
+    def get(self, key):
+        """return the ``CachedResult`` for ``key`` or ``None``"""
+        result = self._results.get(key)
+        if result is None:
+            self._counts['misses'] += 1
+        else:
+            self._counts['hits'] += 1
+            self._results.move_to_end(key)
+        return result
+
+    def put(self, key, count, octets):
+        """store ``count`` results encoded as ``octets``; return them as a
+        ``CachedResult``"""
+        result = CachedResult(count, octets)
+        size = len(octets)
+        if size > self.max_size:
+            return result
+        old = self._results.pop(key, None)
+        if old is not None:
+            self._size -= len(old.octets)
+        while self._results and self._size + size > self.max_size:
+            __, evicted = self._results.popitem(last=False)
+            self._size -= len(evicted.octets)
+            self._counts['evictions'] += 1
+        self._results[key] = result
+        self._size += size
+        return result
+
+    def fetch(self, key, find, encode, chunk_len=CHUNK_LEN):
+        """return the count and an iterator over chunks of encoded results
+        for ``key``, calling ``find()`` on a miss"""
+        cached = self.get(key)
+        if cached is not None:
+            octets = cached.octets
+            chunks = (octets[i:i + CHUNK_SIZE]
+                      for i in range(0, len(octets), CHUNK_SIZE))
+            return cached.count, chunks
+        result = find()
+        return result.count, self._stream(key, result, encode, chunk_len)
+
+    def _stream(self, key, result, encode, chunk_len):
+        parts, size = [], 0
+        items = iter(result.items)
+        while True:
+            chunk = b''.join(map(encode, itertools.islice(items, chunk_len)))
+            if not chunk:
+                break
+            size += len(chunk)
+            if parts is not None and size <= self.max_size:
+                parts.append(chunk)
+            else:  # too large to cache: do not keep it in memory either
+                parts = None
+            yield chunk
+        if parts is not None:
+            self.put(key, result.count, b''.join(parts))
+
+    def stats(self):
+        counts = self._counts
+        return CacheStats(counts['hits'], counts['misses'],
+                          counts['evictions'], len(self._results), self._size)
@@ -0,0 +1,104 @@
+"""
+Run ``charfinder`` queries from an asyncio event loop without stalling it.
+
+A ``QueryRunner`` estimates the cost of each query from the sizes of the
+posting lists it would read. Cheap queries run inline; expensive ones run
+in an executor, at most ``max_pending`` at a time, and fail with
+``asyncio.TimeoutError`` after ``timeout`` seconds::
+
+    >>> from charfinder import UnicodeNameIndex, sample_chars
+    >>> runner = QueryRunner(UnicodeNameIndex(sample_chars), cost_threshold=3,
+    ...                      executor=futures.ThreadPoolExecutor(1))
+    >>> loop = asyncio.new_event_loop()
+    >>> loop.run_until_complete(runner.find_chars('dollar'))
+    QueryResult(count=1, items=['$'])
+    >>> loop.run_until_complete(runner.find_chars('sign', 1))  # 3 postings
+    QueryResult(count=3, items=['₠', '€'])
+    >>> runner.stats()
+    RunnerStats(inline=1, offloaded=1, timeouts=0)
+    >>> loop.close()
+
+Items of the results are lists, so they can be returned from a process
+pool. A query that times out keeps running in its worker until it ends,
+but the ``max_pending`` limit stops those from piling up.
+
+"""
+
+import asyncio
+import collections
+from concurrent import futures
+
+from charfinder import UnicodeNameIndex, QueryResult
+
+COST_THRESHOLD = 50000  # postings; above this, queries leave the loop
+MAX_PENDING = 4
+TIMEOUT = 10  # seconds
+
+RunnerStats = collections.namedtuple('RunnerStats',
+                                     'inline offloaded timeouts')
+
+_index = None  # the index used by executor jobs in this process
+
+
+def _find_chars(query, start, stop, prefix, ranked):
+    global _index
+    if _index is None:  # a spawned worker process: map the index file
+        _index = UnicodeNameIndex()
+    result = _index.find_chars(query, start, stop, prefix, ranked)
+    return QueryResult(result.count, list(result.items))
+
+
+class QueryRunner:
+
+    def __init__(self, index, executor=None, max_pending=MAX_PENDING,
+                 timeout=TIMEOUT, cost_threshold=COST_THRESHOLD):
+        global _index
+        _index = index  # inherited by forked workers and used by threads
+        self.index = index
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.cost_threshold = cost_threshold
+        self._executor = executor
+        self._semaphore = None  # created in the loop that uses it
+        self._counts = collections.Counter()
+
+    @property
+    def executor(self):
+        if self._executor is None:  # not at import: workers may fork
+            self._executor = futures.ProcessPoolExecutor(self.max_pending)
+        return self._executor
+
+    @asyncio.coroutine
+    def find_chars(self, query, start=0, stop=None, prefix=False,
+                   ranked=False):
+        """``index.find_chars`` with the items in a list, run inline or in
+        the executor depending on the estimated cost"""
+        if self.index.estimate_cost(query, prefix) < self.cost_threshold:
+            self._counts['inline'] += 1
+            result = self.index.find_chars(query, start, stop, prefix,
+                                           ranked)
+            return QueryResult(result.count, list(result.items))
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_pending)
+        yield from self._semaphore.acquire()
+        try:
+            self._counts['offloaded'] += 1
+            loop = asyncio.get_event_loop()
+            future = loop.run_in_executor(self.executor, _find_chars,
+                                          query, start, stop, prefix, ranked)
+            return (yield from asyncio.wait_for(future, self.timeout))
+        except asyncio.TimeoutError:
+            self._counts['timeouts'] += 1
+            raise
+        finally:
+            self._semaphore.release()
+
+    def shutdown(self):
+        """stop the executor, if it was started"""
+        if self._executor is not None:
+            self._executor.shutdown()
+
+    def stats(self):
+        counts = self._counts
+        return RunnerStats(counts['inline'], counts['offloaded'],
+                           counts['timeouts'])
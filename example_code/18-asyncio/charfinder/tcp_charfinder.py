@@ -1,15 +1,40 @@
 #!/usr/bin/env python3
 
 # BEGIN TCP_CHARFINDER_TOP
+import os
 import sys
+import re
 import asyncio
+import collections
 
-from charfinder import UnicodeNameIndex  # <1>
+from charfinder import UnicodeNameIndex, page_range  # <1>
+from query_cache import QueryCache, query_key
+from query_executor import QueryRunner
 
 CRLF = b'\r\n'
 PROMPT = b'?> '
+RE_PAGE = re.compile(r'\s*@(\d+)(?:/(\d+))?$')  # "words @page/limit"
+
+# run as a script, a missing index is built with all CPUs; imported, serially
+BUILD_WORKERS = (os.cpu_count() or 1) if __name__ == '__main__' else 1
+index = UnicodeNameIndex(workers=BUILD_WORKERS)  # <2>
+cache = QueryCache()
+runner = QueryRunner(index)  # expensive queries run in a process pool
+counter = collections.Counter()  # queries answered by this process
+
+def encode_line(char):
+    return index.describe_bytes(char) + CRLF
+
+
+def parse_page(query):
+    """split ``'words @page/limit'`` into ``words, start, stop``"""
+    match = RE_PAGE.search(query)
+    if match is None:
+        return (query,) + page_range()
+    page, limit = (int(group) if group else None
+                   for group in match.groups())
+    return (query[:match.start()],) + page_range(page, limit)
 
-index = UnicodeNameIndex()  # <2>
 
 @asyncio.coroutine
 def handle_queries(reader, writer):  # <3>
@@ -17,6 +42,8 @@ def handle_queries(reader, writer):  # <3>
         writer.write(PROMPT)  # can't yield from!  # <5>
         yield from writer.drain()  # must yield from!  # <6>
         data = yield from reader.readline()  # <7>
+        if not data:  # client closed the connection
+            break
         try:
             query = data.decode().strip()
         except UnicodeDecodeError:  # <8>
@@ -26,13 +53,27 @@ def handle_queries(reader, writer):  # <3>
         if query:
             if ord(query[:1]) < 32:  # <11>
                 break
-            lines = list(index.find_description_strs(query)) # <12>
-            if lines:
-                writer.writelines(line.encode() + CRLF for line in lines) # <13>
-            writer.write(index.status(query, len(lines)).encode() + CRLF) # <14>
+            counter['queries'] += 1
+            query, start, stop = parse_page(query)
+            key = query_key(query, start, stop, 'text')
+            result = None  # if cached, fetch does not call find
+            if key not in cache:
+                try:
+                    result = yield from runner.find_chars(  # <12>
+                        query, start, stop, prefix=True, ranked=True)
+                except asyncio.TimeoutError:
+                    msg = 'Timed out searching for {!r}'.format(query)
+                    writer.write(msg.encode() + CRLF)
+                    continue
+            count, chunks = cache.fetch(key, lambda: result, encode_line)
+            for chunk in chunks:
+                writer.write(chunk)  # <13>
+                yield from writer.drain()  # wait if the client is slow
+            writer.write(index.status(query, count).encode() + CRLF) # <14>
 
             yield from writer.drain()  # <15>
-            print('Sent {} results'.format(len(lines)))  # <16>
+            sent = max(min(count, stop or count) - start, 0)
+            print('Sent {} of {} results'.format(sent, count))  # <16>
 
     print('Close the client socket')  # <17>
     writer.close()  # <18>
@@ -54,6 +95,9 @@ def main(address='127.0.0.1', port=2323):  # <1>
         pass
 
     print('Server shutting down.')
+    print('Query cache: {}'.format(cache.stats()))
+    print('Query runner: {}'.format(runner.stats()))
+    runner.shutdown()
     server.close()  # <7>
     loop.run_until_complete(server.wait_closed())  # <8>
     loop.close()  # <9>
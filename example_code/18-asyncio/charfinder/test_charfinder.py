@@ -1,6 +1,11 @@
+from array import array
+
 import pytest
 
+import charfinder
 from charfinder import UnicodeNameIndex, tokenize, sample_chars, query_type
+from charfinder import intersect
+from index_file import MappedIndex, DescriptionTable, save_index
 from unicodedata import name
 
 
@@ -113,3 +118,102 @@ def test_find_with_start_stop(sample_index):
            for char in sample_index.find_chars('sign', 1, 2).items]
     assert res == [(8352, 'EURO-CURRENCY SIGN')]
 
+
+
+def test_load_saved_index(monkeypatch, tmp_path):
+    monkeypatch.setattr(charfinder, 'INDEX_NAME', str(tmp_path / 'test.idx'))
+    monkeypatch.setattr(charfinder, 'MINIMUM_SAVE_LEN', 5)
+    built_index = UnicodeNameIndex(sample_chars)
+    loaded_index = UnicodeNameIndex()
+    assert isinstance(loaded_index.index, MappedIndex)
+    assert list(loaded_index.index) == sorted(built_index.index)
+    for query in ['sign', 'latin letter', 'euro sign', 'qwertyuiop']:
+        assert (list(loaded_index.find_chars(query).items) ==
+                list(built_index.find_chars(query).items))
+    for char in sample_chars:
+        assert (loaded_index.describe_str(char) ==
+                built_index.describe_str(char) ==
+                '{:7}\t{}\t{}'.format(*built_index.describe(char)))
+
+
+@pytest.mark.parametrize('short_len, long_len', [(0, 10), (5, 10), (5, 500)])
+def test_intersect(short_len, long_len):
+    short = array('I', range(0, short_len * 3, 3))
+    long = array('I', range(0, long_len * 2, 2))
+    expected = sorted(set(short) & set(long))
+    assert intersect(short, long).tolist() == expected
+
+
+def test_find_chars_sorted_full(full_index):
+    res = full_index.find_chars('latin letter small')
+    codepoints = [ord(char) for char in res.items]
+    assert codepoints == sorted(codepoints)
+    assert len(codepoints) == res.count
+
+
+def test_find_prefix(sample_index):
+    res = sample_index.find_chars('eur', prefix=True)
+    assert [name(char) for char in res.items] == ['EURO-CURRENCY SIGN',
+                                                  'EURO SIGN']
+    assert sample_index.find_chars('eur').count == 0
+
+
+def test_find_prefix_exact_first(full_index):
+    res = full_index.find_chars('white che', 0, 3, prefix=True)
+    assert all(name(char).startswith('WHITE CHESS') for char in res.items)
+    res = full_index.find_chars('arrow', prefix=True)
+    exact = full_index.find_chars('arrow')
+    assert res.count > exact.count
+    assert list(res.items)[:exact.count] == list(exact.items)
+
+
+def test_find_ranked(full_index):
+    res = full_index.find_chars('arro', 0, 3, prefix=True, ranked=True)
+    assert [name(char) for char in res.items] == [
+        'LEFTWARDS ARROW', 'UPWARDS ARROW', 'RIGHTWARDS ARROW']
+    ranked = full_index.find_chars('sign', prefix=True, ranked=True)
+    first_page = full_index.find_chars('sign', 0, 10, prefix=True,
+                                       ranked=True)
+    assert ranked.count == first_page.count
+    assert list(ranked.items)[:10] == list(first_page.items)
+
+
+@pytest.mark.parametrize('index_name', ['sample_index', 'full_index'])
+def test_word_rank_top(index_name, request):
+    index = request.getfixturevalue(index_name)
+    assert index.word_rank(3) == index.word_rank()[:3]
+
+
+def test_update_index(monkeypatch, tmp_path, full_index):
+    pattern = str(tmp_path / 'test-{}.idx')
+    monkeypatch.setattr(charfinder, 'INDEX_PATTERN', pattern)
+    monkeypatch.setattr(charfinder, 'INDEX_NAME', pattern.format('new'))
+    # an older version: no EURO SIGN, and DOLLAR SIGN was named DOLLAR
+    words = {word: [cp for cp in codepoints if cp != 8364]
+             for word, codepoints in full_index.index.prefix_items('')}
+    words = {word: codepoints for word, codepoints in words.items()
+             if codepoints}
+    words['SIGN'].remove(36)
+    descriptions = full_index.descriptions
+    lines = [(cp, descriptions.get(cp), descriptions.ranks[cp])
+             for cp in range(descriptions.limit)
+             if descriptions.get(cp) and cp != 8364]
+    lines[lines.index((36, b'U+0024 \t$\tDOLLAR SIGN', 2))] = (
+        36, b'U+0024 \t$\tDOLLAR', 1)
+    meta = dict(charfinder.index_meta(), unicode_version='old')
+    save_index(pattern.format('old'), words,
+               DescriptionTable.fromlines(lines), meta)
+
+    base = UnicodeNameIndex.find_base()
+    assert base.meta['unicode_version'] == 'old'
+    assert UnicodeNameIndex(sample_chars).update_index(base) == 2
+    UnicodeNameIndex()  # updates the old index, and saves it
+    updated = UnicodeNameIndex()
+    assert isinstance(updated.index, MappedIndex)
+    assert updated.index.meta == charfinder.index_meta()
+    assert dict(updated.index.counts()) == dict(full_index.index.counts())
+    for query in ['sign', 'dollar sign', 'euro']:
+        assert (list(updated.find_chars(query).items) ==
+                list(full_index.find_chars(query).items))
+    assert updated.describe_str('$') == full_index.describe_str('$')
+    assert updated.describe_str('€') == full_index.describe_str('€')